@@ -0,0 +1,131 @@
+# Generic version of the recursions in sum_one_solver.py.
+
+# Every node of an infinite m-ary tree is 0 with probability p and 1 otherwise.
+# Define f_j(p) := probability that there exists an infinite path from the root
+# with at most j ones. Conditioning on the root value as in (Eq. 3) and (Eq. 6):
+
+#   f_j = p * (1 - (1 - f_j)^m) + (1 - p) * (1 - (1 - f_{j-1})^m),   f_{-1} = 0
+
+# For j = 0 this is (Eq. 3) with x = f_0, and for j = 1, m = 2 it is (Eq. 6).
+# Instead of eliminating variables by hand, we solve the coupled system
+# f_0 ... f_k with Newton's method, vectorized over many values of p at once.
+
+# Every f_j = 0 is a fixed point too; the probabilities we want are the largest
+# fixed point, which Newton reaches monotonically when started from f = 1
+# because each equation is concave in f_j.
+
+import argparse
+
+import numpy as np
+
+
+def _residual_and_jacobian(f: np.ndarray, p: np.ndarray, m: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Residual G(f) = F(f) - f for a batch of shape (n, k + 1), together with its
+    Jacobian. dG_j/df_j only couples to f_{j-1}, so the Jacobian is lower
+    bidiagonal and is returned as (diagonal, subdiagonal).
+    """
+    q = p[:, None]
+    survive = 1 - (1 - f) ** m
+    dsurvive = m * (1 - f) ** (m - 1)
+
+    prev_survive = np.zeros_like(f)
+    prev_survive[:, 1:] = survive[:, :-1]
+    residual = q * survive + (1 - q) * prev_survive - f
+
+    # At a critical point (p * m = 1 with f_j = 0) the diagonal vanishes;
+    # fall back to a plain fixed-point step there so the system stays solvable.
+    diag = q * dsurvive - 1
+    diag = np.where(np.abs(diag) < 1e-12, -1.0, diag)
+    sub = (1 - q) * dsurvive[:, :-1]
+    return residual, diag, sub
+
+
+def _newton_step(residual: np.ndarray, diag: np.ndarray, sub: np.ndarray) -> np.ndarray:
+    """Solves J @ step = -residual by forward substitution on the bidiagonal J."""
+    step = np.empty_like(residual)
+    step[:, 0] = -residual[:, 0] / diag[:, 0]
+    for j in range(1, residual.shape[1]):
+        step[:, j] = (-residual[:, j] - sub[:, j - 1] * step[:, j - 1]) / diag[:, j]
+    return step
+
+
+def solve_fixed_point(
+    p: np.ndarray | float,
+    k: int = 1,
+    m: int = 2,
+    tolerance: float = 1e-12,
+    max_iterations: int = 200,
+) -> np.ndarray:
+    """
+    Solves for f_0(p) ... f_k(p) on an m-ary tree.
+
+    Args:
+        p: Probability (or array of probabilities) that a node is 0.
+        k: Maximum number of ones allowed on the path.
+        m: Branching factor of the tree.
+        tolerance: Convergence criterion on the Newton step (max norm).
+        max_iterations: Maximum number of Newton steps.
+
+    Returns:
+        Array of shape (len(p), k + 1) whose column j is f_j(p).
+    """
+    p = np.asarray(p, dtype=float).reshape(-1)
+    # With p * m <= 1 the all-zero subtrees die out almost surely, so no path
+    # with finitely many ones survives; Newton would only crawl towards 0 there.
+    active = p * m > 1
+    f = np.where(active[:, None], 1.0, 0.0) * np.ones((p.size, k + 1))
+
+    for _ in range(max_iterations):
+        if not active.any():
+            break
+        residual, diag, sub = _residual_and_jacobian(f[active], p[active], m)
+        step = _newton_step(residual, diag, sub)
+        f[active] = np.clip(f[active] + step, 0.0, 1.0)
+        # Near p = 1/m the system is ill-conditioned and the step can jitter
+        # above 'tolerance' long after the residual has hit rounding level.
+        still = (np.abs(step).max(axis=1) >= tolerance) & (np.abs(residual).max(axis=1) > 1e-15)
+        active[np.flatnonzero(active)[~still]] = False
+
+    return f
+
+
+def solve_threshold(
+    targets: np.ndarray | float,
+    k: int = 1,
+    m: int = 2,
+    tolerance: float = 1e-10,
+    max_iterations: int = 100,
+) -> np.ndarray:
+    """
+    Finds p with f_k(p) = target for each target, by bisection on p.
+
+    f_k is nondecreasing in p, so all targets are bisected together; each
+    round costs one vectorized fixed-point solve.
+    """
+    targets = np.asarray(targets, dtype=float).reshape(-1)
+    lo = np.full_like(targets, 1 / m)  # f_k vanishes for p <= 1/m
+    hi = np.ones_like(targets)
+    for _ in range(max_iterations):
+        mid = (lo + hi) / 2
+        below = solve_fixed_point(mid, k, m)[:, k] < targets
+        lo = np.where(below, mid, lo)
+        hi = np.where(below, hi, mid)
+        if (hi - lo).max() < tolerance:
+            break
+    return (lo + hi) / 2
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Solve f_k(p) = target on an m-ary tree.")
+    parser.add_argument("--target", type=float, default=0.5)
+    parser.add_argument("-k", type=int, default=1, help="maximum number of ones on the path")
+    parser.add_argument("-m", type=int, default=2, help="branching factor")
+    args = parser.parse_args()
+
+    root = solve_threshold(args.target, args.k, args.m)[0]
+    print(f"Root found: {root:.10f}")
+
+
+if __name__ == "__main__":
+    main()
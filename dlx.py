@@ -0,0 +1,189 @@
+"""
+Knuth's Algorithm X with Dancing Links.
+
+Primary columns must be covered exactly once; secondary columns at most
+once (they are never chosen for branching, only covered when a row uses
+them). Nodes live in flat integer arrays rather than objects, which keeps
+cover/uncover cheap in Python.
+"""
+from typing import Callable, Hashable, Iterator, List, Optional, Sequence
+
+
+class DLX:
+    def __init__(self, primary: Sequence[Hashable], secondary: Sequence[Hashable] = ()):
+        columns = list(primary) + list(secondary)
+        if len(set(columns)) != len(columns):
+            raise ValueError("Duplicate column names")
+        self.col_index = {name: i + 1 for i, name in enumerate(columns)}
+        n = len(columns) + 1  # node 0 is the root header
+        self.L = list(range(-1, n - 1))
+        self.R = list(range(1, n + 1))
+        self.U = list(range(n))
+        self.D = list(range(n))
+        self.C = list(range(n))
+        self.S = [0] * n
+        self.row_of = [-1] * n
+        # Close the primary header ring; secondary headers point to themselves.
+        last_primary = len(primary)
+        self.L[0] = last_primary
+        self.R[last_primary] = 0
+        for c in range(last_primary + 1, n):
+            self.L[c] = self.R[c] = c
+        self.rows: List[Hashable] = []
+
+    def add_row(self, row_id: Hashable, columns: Sequence[Hashable]) -> None:
+        """Add a row covering the named columns."""
+        if not columns:
+            raise ValueError("A row must cover at least one column")
+        row_index = len(self.rows)
+        self.rows.append(row_id)
+        first = None
+        for name in columns:
+            c = self.col_index[name]
+            node = len(self.C)
+            self.C.append(c)
+            self.row_of.append(row_index)
+            # vertical: insert above the header (i.e. at the bottom)
+            self.U.append(self.U[c])
+            self.D.append(c)
+            self.D[self.U[c]] = node
+            self.U[c] = node
+            self.S[c] += 1
+            # horizontal: circular list of the row's nodes
+            if first is None:
+                first = node
+                self.L.append(node)
+                self.R.append(node)
+            else:
+                self.L.append(self.L[first])
+                self.R.append(first)
+                self.R[self.L[first]] = node
+                self.L[first] = node
+
+    def _cover(self, c: int) -> None:
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        R[L[c]] = R[c]
+        L[R[c]] = L[c]
+        i = D[c]
+        while i != c:
+            j = R[i]
+            while j != i:
+                D[U[j]] = D[j]
+                U[D[j]] = U[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def _uncover(self, c: int) -> None:
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[c]
+        while i != c:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                D[U[j]] = j
+                U[D[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[c]] = c
+        L[R[c]] = c
+
+    def _choose_column(self) -> int:
+        """The primary column with the fewest remaining rows."""
+        R, S = self.R, self.S
+        c = R[0]
+        best = c
+        while c != 0:
+            if S[c] < S[best]:
+                best = c
+            c = R[c]
+        return best
+
+    def _select(self, r: int) -> None:
+        j = self.R[r]
+        while j != r:
+            self._cover(self.C[j])
+            j = self.R[j]
+
+    def _deselect(self, r: int) -> None:
+        j = self.L[r]
+        while j != r:
+            self._uncover(self.C[j])
+            j = self.L[j]
+
+    def iter_solutions(
+        self,
+        limit: Optional[int] = None,
+        accept: Optional[Callable[[List[Hashable]], bool]] = None,
+    ) -> Iterator[List[Hashable]]:
+        """
+        Yield every exact cover as a list of row ids, in a deterministic order.
+        'accept' is called with the partial solution after each row is chosen;
+        returning False prunes that branch (for constraints that are not
+        expressible as columns). The links are restored even if the caller
+        stops iterating early.
+        """
+        D, S = self.D, self.S
+        partial: List[Hashable] = []
+        found = 0
+
+        def search():
+            nonlocal found
+            if self.R[0] == 0:
+                found += 1
+                yield list(partial)
+                return
+            best = self._choose_column()
+            if S[best] == 0:
+                return
+            self._cover(best)
+            try:
+                r = D[best]
+                while r != best:
+                    partial.append(self.rows[self.row_of[r]])
+                    self._select(r)
+                    try:
+                        if accept is None or accept(partial):
+                            yield from search()
+                    finally:
+                        self._deselect(r)
+                        partial.pop()
+                    if limit is not None and found >= limit:
+                        return
+                    r = D[r]
+            finally:
+                self._uncover(best)
+
+        yield from search()
+
+    def count(self, limit: Optional[int] = None, accept: Optional[Callable[[List[Hashable]], bool]] = None) -> int:
+        """
+        Number of exact covers (capped at 'limit'). Walks the same tree as
+        iter_solutions but never materializes a solution.
+        """
+        D, S = self.D, self.S
+        partial: List[Hashable] = []
+        cap = float("inf") if limit is None else limit
+
+        def search(found: int) -> int:
+            if self.R[0] == 0:
+                return found + 1
+            best = self._choose_column()
+            if S[best] == 0:
+                return found
+            self._cover(best)
+            r = D[best]
+            while r != best and found < cap:
+                if accept is not None:
+                    partial.append(self.rows[self.row_of[r]])
+                self._select(r)
+                if accept is None or accept(partial):
+                    found = search(found)
+                self._deselect(r)
+                if accept is not None:
+                    partial.pop()
+                r = D[r]
+            self._uncover(best)
+            return found
+
+        return search(0)
@@ -1,14 +1,140 @@
+import argparse
+import random
 import sys
+from collections import OrderedDict
+
+from solve_cache import add_cache_arguments, cached_solve, report_hit
 sys.setrecursionlimit(10_000)
 
+# Trace output for every step of the search; main() turns it on with --debug
+DEBUG = False
+
+# Bump when a change could alter results, so cached solutions are not reused
+SOLVER_VERSION = 1
+
 MIN_EDGE = -0.5
 MAX_EDGE = 10.5
 
+# Each challenge has:
+#   "origin": starting coordinate
+#   "vector": direction
+#   "target": expected product
+CHALLENGES = [
+    { "origin": (10.5, 8.5),  "vector": (-1, 0),  "target": 4 },
+    { "origin": (10.5, 7.5),  "vector": (-1, 0),  "target": 27 },
+    { "origin": (10.5, 3.5),  "vector": (-1, 0),  "target": 16 },
+    { "origin": (7.5, -0.5),  "vector": (0, 1),   "target": 405 },
+    { "origin": (5.5, -0.5),  "vector": (0, 1),   "target": 5 },
+    { "origin": (4.5, -0.5),  "vector": (0, 1),   "target": 64 },
+    { "origin": (3.5, -0.5),  "vector": (0, 1),   "target": 12 },
+    { "origin": (0.5, -0.5),  "vector": (0, 1),   "target": 2025 },
+    { "origin": (-0.5, 1.5),  "vector": (1, 0),   "target": 225 },
+    { "origin": (-0.5, 2.5),  "vector": (1, 0),   "target": 12 },
+    { "origin": (-0.5, 6.5),  "vector": (1, 0),   "target": 27 },
+    { "origin": (2.5, 10.5),  "vector": (0, -1),  "target": 112 },
+    { "origin": (4.5, 10.5),  "vector": (0, -1),  "target": 48 },
+    { "origin": (5.5, 10.5),  "vector": (0, -1),  "target": 3087 },
+    { "origin": (6.5, 10.5),  "vector": (0, -1),  "target": 9 },
+]
+
+# ---- Transposition table ----
+# Zobrist hashing: every (position, diagonal kind) gets a fixed random
+# 64-bit word and an arrangement's key is the XOR of the words of its
+# mirrors, so placing or removing a mirror updates the key in O(1) and the
+# same set of mirrors gets the same key whatever order it was built in.
+_ZOBRIST_RNG = random.Random(0x4D1440)
+_ZOBRIST = {}
+
+# Failed (arrangement key, challenge index) states kept by complete_all_challenges
+TRANSPOSITION_CAPACITY = 1 << 16
+
+def zobrist_word(pos, diag_type):
+    word = _ZOBRIST.get((pos, diag_type))
+    if word is None:
+        word = _ZOBRIST[(pos, diag_type)] = _ZOBRIST_RNG.getrandbits(64)
+    return word
+
+class ZobristArrangement(dict):
+    """
+    Arrangement dict {(x, y): (diag_type, _)} that keeps its Zobrist key in
+    'key' up to date on every insert/remove; copy() carries the key along.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.key = 0
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, pos, value):
+        if pos in self:
+            self.key ^= zobrist_word(pos, self[pos][0])
+        super().__setitem__(pos, value)
+        self.key ^= zobrist_word(pos, value[0])
+
+    def __delitem__(self, pos):
+        self.key ^= zobrist_word(pos, self[pos][0])
+        super().__delitem__(pos)
+
+    def pop(self, pos, *default):
+        if pos in self:
+            self.key ^= zobrist_word(pos, self[pos][0])
+        return super().pop(pos, *default)
+
+    def update(self, *args, **kwargs):
+        for pos, value in dict(*args, **kwargs).items():
+            self[pos] = value
+
+    def clear(self):
+        super().clear()
+        self.key = 0
+
+    def copy(self):
+        new = ZobristArrangement.__new__(ZobristArrangement)  # skip __init__'s per-item rehash
+        dict.update(new, self)
+        new.key = self.key
+        return new
+
+class SearchBudgetExceeded(Exception):
+    pass
+
+class TranspositionTable:
+    """
+    Bounded LRU set of (arrangement key, challenge index) states known to fail.
+    It also counts the states the search visits and raises
+    SearchBudgetExceeded past 'max_visits' (None = unbounded).
+    """
+
+    def __init__(self, capacity=TRANSPOSITION_CAPACITY, max_visits=None):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.visits = 0
+        self.max_visits = max_visits
+
+    def visit(self):
+        self.visits += 1
+        if self.max_visits is not None and self.visits > self.max_visits:
+            raise SearchBudgetExceeded()
+
+    def __contains__(self, state):
+        if state in self.entries:
+            self.entries.move_to_end(state)
+            self.hits += 1
+            return True
+        return False
+
+    def add(self, state):
+        self.entries[state] = None
+        self.entries.move_to_end(state)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
 def steps_before_leaving(ax, ay, vx, vy):
     """
     Determines how many whole steps can be taken from (ax, ay) in the direction (vx, vy) before going out of the valid grid.
     """
-    print(f"[DEBUG] steps_before_leaving called with position=({ax},{ay}), direction=({vx},{vy})")
+    if DEBUG:
+        print(f"[DEBUG] steps_before_leaving called with position=({ax},{ay}), direction=({vx},{vy})")
     if vx > 0:
         distance = int(MAX_EDGE - ax)
     elif vx < 0:
@@ -19,7 +145,8 @@ def steps_before_leaving(ax, ay, vx, vy):
         distance = int(ay - MIN_EDGE)
     else:
         distance = 0
-    print(f"[DEBUG] steps_before_leaving returning {distance}")
+    if DEBUG:
+        print(f"[DEBUG] steps_before_leaving returning {distance}")
     return distance
 
 def is_diagonal_placement_possible(arrangement, px, py):
@@ -28,14 +155,17 @@ def is_diagonal_placement_possible(arrangement, px, py):
       1) That spot is free.
       2) None of the four adjacent spots already hold a diagonal.
     """
-    print(f"[DEBUG] Checking diagonal feasibility at ({px},{py})")
+    if DEBUG:
+        print(f"[DEBUG] Checking diagonal feasibility at ({px},{py})")
     if (px, py) in arrangement:
-        print(f"[DEBUG] Spot ({px},{py}) is already occupied.")
+        if DEBUG:
+            print(f"[DEBUG] Spot ({px},{py}) is already occupied.")
         return False
     for vx, vy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
         adj_x, adj_y = px + vx, py + vy
         if (adj_x, adj_y) in arrangement:
-            print(f"[DEBUG] Adjacent spot ({adj_x},{adj_y}) is occupied. Cannot place diagonal.")
+            if DEBUG:
+                print(f"[DEBUG] Adjacent spot ({adj_x},{adj_y}) is occupied. Cannot place diagonal.")
             return False
     return True
 
@@ -43,7 +173,8 @@ def bounce(direction, diag_type):
     """
     Modifies the incoming direction vector (dx, dy) when hitting either a '/' or '\' diagonal, returning the new direction.
     """
-    print(f"[DEBUG] bounce called with direction={direction}, diag_type={diag_type}")
+    if DEBUG:
+        print(f"[DEBUG] bounce called with direction={direction}, diag_type={diag_type}")
     dx, dy = direction
     if diag_type == '/':
         if (dx, dy) == (-1, 0):
@@ -73,7 +204,8 @@ def evaluate_laser_path_product(arrangement, origin, vector):
     vector on the provided arrangement. Continues until the laser
     goes off the board, multiplying each traveled segment length.
     """
-    print(f"[DEBUG] evaluate_laser_path_product: Starting from origin={origin} with vector={vector}")
+    if DEBUG:
+        print(f"[DEBUG] evaluate_laser_path_product: Starting from origin={origin} with vector={vector}")
     x, y = origin
     dx, dy = vector
     product_accumulator = 1
@@ -101,7 +233,8 @@ def evaluate_laser_path_product(arrangement, origin, vector):
         else:
             break
 
-    print(f"[DEBUG] evaluate_laser_path_product: Final product is {product_accumulator}")
+    if DEBUG:
+        print(f"[DEBUG] evaluate_laser_path_product: Final product is {product_accumulator}")
     return product_accumulator
 
 def explore_laser_configurations(arrangement, lx, ly, vx, vy, current_mult, target_mult):
@@ -111,13 +244,15 @@ def explore_laser_configurations(arrangement, lx, ly, vx, vy, current_mult, targ
     of traveled distances, and 'target_mult' is the desired final product.
     Yields all possible valid arrangements meeting the target.
     """
-    print(f"[DEBUG] explore_laser_configurations called with laser=({lx},{ly}), direction=({vx},{vy}), "
-          f"current_mult={current_mult}, target_mult={target_mult}")
+    if DEBUG:
+        print(f"[DEBUG] explore_laser_configurations called with laser=({lx},{ly}), direction=({vx},{vy}), "
+              f"current_mult={current_mult}, target_mult={target_mult}")
     
     to_wall = steps_before_leaving(lx, ly, vx, vy)
     
     if current_mult * to_wall == target_mult:
-        print("[DEBUG] Found matching configuration with no additional diagonals needed.")
+        if DEBUG:
+            print("[DEBUG] Found matching configuration with no additional diagonals needed.")
         yield arrangement
     
     for step in range(1, to_wall):
@@ -162,21 +297,50 @@ def explore_laser_configurations(arrangement, lx, ly, vx, vy, current_mult, targ
                     target_mult
                 )
 
-def complete_all_challenges(challenges, arrangement, idx=0):
+def complete_all_challenges(challenges, arrangement, idx=0, failed=None):
     """
     Recursively attempts to solve each challenge in 'challenges'.
     After placing diagonals for the current challenge, re-check all previously
     solved ones to ensure no prior constraints were disrupted.
+    Returns the first complete arrangement, or None.
+    """
+    return next(iter_challenge_solutions(challenges, arrangement, idx, failed), None)
+
+def iter_challenge_solutions(challenges, arrangement, idx=0, failed=None, seen=None):
     """
-    print(f"[DEBUG] complete_all_challenges at index={idx}")
+    Yields every distinct arrangement that satisfies all challenges (only
+    placing diagonals on the challenged lasers' paths), in search order.
+    Whether a state can be completed only depends on (arrangement, idx), so
+    states that produced nothing are remembered in 'failed' (a
+    TranspositionTable) and skipped when another placement order reaches
+    them again; 'seen' holds the keys of the arrangements already yielded.
+    """
+    if DEBUG:
+        print(f"[DEBUG] complete_all_challenges at index={idx}")
+    if not isinstance(arrangement, ZobristArrangement):
+        arrangement = ZobristArrangement(arrangement)
+    if failed is None:
+        failed = TranspositionTable()
+    if seen is None:
+        seen = set()
+    failed.visit()
     if idx == len(challenges):
-        return arrangement
+        if arrangement.key not in seen:
+            seen.add(arrangement.key)
+            yield arrangement
+        return
+    state = (arrangement.key, idx)
+    if state in failed:
+        if DEBUG:
+            print(f"[DEBUG] Skipping known dead state at index={idx}")
+        return
 
     challenge = challenges[idx]
     origin = challenge["origin"]
     vector = challenge["vector"]
     target = challenge["target"]
 
+    produced = False
     for candidate_arrangement in explore_laser_configurations(
         arrangement,
         origin[0],
@@ -202,11 +366,12 @@ def complete_all_challenges(challenges, arrangement, idx=0):
         if not all_ok:
             continue
 
-        outcome = complete_all_challenges(challenges, candidate_arrangement, idx + 1)
-        if outcome is not None:
-            return outcome
+        for outcome in iter_challenge_solutions(challenges, candidate_arrangement, idx + 1, failed, seen):
+            produced = True
+            yield outcome
 
-    return None
+    if not produced:
+        failed.add(state)
 
 def display_arrangement(arrangement):
     """
@@ -225,33 +390,29 @@ def display_arrangement(arrangement):
     print()
 
 def main():
-    # Each challenge has:
-    #   "origin": starting coordinate
-    #   "vector": direction
-    #   "target": expected product
-    challenges = [
-        { "origin": (10.5, 8.5),  "vector": (-1, 0),  "target": 4 },
-        { "origin": (10.5, 7.5),  "vector": (-1, 0),  "target": 27 },
-        { "origin": (10.5, 3.5),  "vector": (-1, 0),  "target": 16 },
-        { "origin": (7.5, -0.5),  "vector": (0, 1),   "target": 405 },
-        { "origin": (5.5, -0.5),  "vector": (0, 1),   "target": 5 },
-        { "origin": (4.5, -0.5),  "vector": (0, 1),   "target": 64 },
-        { "origin": (3.5, -0.5),  "vector": (0, 1),   "target": 12 },
-        { "origin": (0.5, -0.5),  "vector": (0, 1),   "target": 2025 },
-        { "origin": (-0.5, 1.5),  "vector": (1, 0),   "target": 225 },
-        { "origin": (-0.5, 2.5),  "vector": (1, 0),   "target": 12 },
-        { "origin": (-0.5, 6.5),  "vector": (1, 0),   "target": 27 },
-        { "origin": (2.5, 10.5),  "vector": (0, -1),  "target": 112 },
-        { "origin": (4.5, 10.5),  "vector": (0, -1),  "target": 48 },
-        { "origin": (5.5, 10.5),  "vector": (0, -1),  "target": 3087 },
-        { "origin": (6.5, 10.5),  "vector": (0, -1),  "target": 9 },
-    ]
+    global DEBUG
+    parser = argparse.ArgumentParser(description="Solve the Hall of Mirrors instance in CHALLENGES.")
+    parser.add_argument("--debug", action="store_true", help="trace every step of the search")
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+    DEBUG = args.debug
+
+    challenges = [dict(c) for c in CHALLENGES]
 
     # Sort by target for incremental constraint application.
     challenges.sort(key=lambda c: c["target"])
 
-    initial_arrangement = {}
-    final_layout = complete_all_challenges(challenges, initial_arrangement, 0)
+    def solve():
+        initial_arrangement = {}
+        failed = TranspositionTable()
+        layout = complete_all_challenges(challenges, initial_arrangement, 0, failed)
+        mirrors = None if layout is None else sorted([x, y, kind] for (x, y), (kind, _) in layout.items())
+        return mirrors, failed.visits
+
+    # The cache holds the mirrors as [x, y, kind] lists
+    mirrors, hit = cached_solve("hall_of_mirrors", SOLVER_VERSION, {"challenges": challenges}, solve, args.cache)
+    report_hit(hit)
+    final_layout = None if mirrors is None else {(x, y): (kind, None) for x, y, kind in mirrors}
 
     if final_layout is None:
         print("\n\n[DEBUG] No final solution could be found :(")
@@ -0,0 +1,307 @@
+"""
+Bitboard pentomino placement for the Hooks grid.
+
+Cell (r, c) is bit r * size + c of a Python int, so a placement, the
+occupancy and every 2x2 window are single integers. Everything that only
+depends on the grid size and the shapes (placement masks per shape and
+per row, the 2x2 window masks each placement can complete) is computed
+once; the search itself only does ANDs, ORs and popcounts.
+"""
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+import random
+
+Cell = Tuple[int, int]
+
+
+class Placement(NamedTuple):
+    mask: int
+    windows: Tuple[int, ...]  # 2x2 window masks this placement touches
+
+
+def cell_bit(r: int, c: int, size: int) -> int:
+    return 1 << (r * size + c)
+
+
+def cells_to_mask(cells: Iterable[Cell], size: int) -> int:
+    mask = 0
+    for r, c in cells:
+        mask |= cell_bit(r, c, size)
+    return mask
+
+
+def mask_to_cells(mask: int, size: int) -> Set[Cell]:
+    cells = set()
+    while mask:
+        low = mask & -mask
+        idx = low.bit_length() - 1
+        cells.add(divmod(idx, size))
+        mask ^= low
+    return cells
+
+
+@lru_cache(maxsize=None)
+def window_masks(size: int) -> Tuple[Tuple[int, ...], ...]:
+    """cell index -> masks of the (up to four) 2x2 windows containing that cell."""
+    per_cell: List[List[int]] = [[] for _ in range(size * size)]
+    for r in range(size - 1):
+        for c in range(size - 1):
+            w = cells_to_mask(((r, c), (r + 1, c), (r, c + 1), (r + 1, c + 1)), size)
+            for cell in ((r, c), (r + 1, c), (r, c + 1), (r + 1, c + 1)):
+                per_cell[cell[0] * size + cell[1]].append(w)
+    return tuple(tuple(ws) for ws in per_cell)
+
+
+def make_placement(cells: Iterable[Cell], size: int) -> Placement:
+    cells = list(cells)
+    per_cell = window_masks(size)
+    windows = sorted({w for r, c in cells for w in per_cell[r * size + c]})
+    return Placement(cells_to_mask(cells, size), tuple(windows))
+
+
+def placements_by_row(masks: Iterable[int], size: int) -> Dict[int, Tuple[Placement, ...]]:
+    """
+    row -> every placement mask (e.g. polyomino_library.placement_masks) with
+    at least one cell in that row, in a fixed order.
+    """
+    by_row: Dict[int, List[int]] = {r: [] for r in range(size)}
+    row_bits = (1 << size) - 1
+    for mask in sorted(set(masks)):
+        for row in range(size):
+            if mask >> (row * size) & row_bits:
+                by_row[row].append(mask)
+    return {row: tuple(make_placement(mask_to_cells(m, size), size) for m in ms) for row, ms in by_row.items()}
+
+
+def any_full_2x2(filled: int, size: int) -> bool:
+    for ws in window_masks(size):
+        for w in ws:
+            if filled & w == w:
+                return True
+    return False
+
+
+class PlacementSearch:
+    """
+    Backtracking over shapes with bitboard candidate lists.
+
+    Each node keeps, per remaining shape, the list of placements still legal
+    there; a child only re-filters its parent's lists against the newly
+    placed piece instead of regenerating candidates from scratch. Shapes
+    are branched fewest-candidates-first.
+
+    Optional hook constraints: 'region_masks' partitions the grid and
+    'capacity' caps how many newly filled cells each region may receive.
+    Cells in 'fixed' (e.g. givens) are already filled: they count for the
+    2x2 rule, may be covered by a piece and do not use up capacity.
+
+    If 'constraints' is set (e.g. a hooks_constraints.HooksConstraints) it is
+    kept in sync through place(mask)/undo(), and branches where its ok() is
+    False are pruned right after the placement.
+
+    With 'exact' set, a full placement only counts if it uses up every
+    region's capacity and, if 'constraints' is set, its complete_ok() holds.
+    Branches whose remaining shapes are too small to use up the capacity
+    left are pruned.
+
+    If 'observer' is set it is called as observer(search, assignment) on
+    entering every node, with the partial {name: mask} assignment; it may
+    block (pause) or raise (cancel) to control a long search from outside.
+    """
+
+    def __init__(
+        self,
+        candidates: Dict[str, Sequence[Placement]],
+        size: int,
+        fixed: int = 0,
+        region_masks: Optional[Sequence[int]] = None,
+        capacity: Optional[Sequence[int]] = None,
+    ):
+        self.size = size
+        self.fixed = fixed
+        self.capacity = list(capacity or [])
+        regions = list(region_masks or [])
+        # Per placement: (region index, newly filled cells in it), nonzero entries only
+        self.cost: Dict[int, Tuple[Tuple[int, int], ...]] = {}
+        for cands in candidates.values():
+            for p in cands:
+                new_cells = p.mask & ~fixed
+                self.cost[p.mask] = tuple(
+                    (i, n) for i, region in enumerate(regions) if (n := (new_cells & region).bit_count())
+                )
+        self.candidates = {name: self._legal(list(cands), 0, self.capacity) for name, cands in candidates.items()}
+        self.max_cells = {name: max((p.mask.bit_count() for p in cands), default=0)
+                          for name, cands in candidates.items()}
+        self.exact = False
+        self.nodes = 0
+        self.backtracks = 0
+        self.observer: Optional[Callable[["PlacementSearch", Dict[str, int]], None]] = None
+        self.constraints = None
+
+    def _accept(self, p: Placement) -> bool:
+        """Place p on the constraint state; if it is rejected the state is already restored."""
+        self.constraints.place(p.mask)
+        if self.constraints.ok():
+            return True
+        self.constraints.undo()
+        return False
+
+    def _fits(self, p: Placement, occ: int, capacity: List[int]) -> bool:
+        if p.mask & occ:
+            return False
+        filled = occ | self.fixed | p.mask
+        for w in p.windows:
+            if filled & w == w:
+                return False
+        for i, n in self.cost[p.mask]:
+            if n > capacity[i]:
+                return False
+        return True
+
+    def _can_fill(self, capacity: List[int], shapes: Iterable[str]) -> bool:
+        """False if, with 'exact', the remaining shapes cannot use up the capacity left."""
+        return not self.exact or sum(capacity) <= sum(self.max_cells[s] for s in shapes)
+
+    def _complete(self, capacity: List[int]) -> bool:
+        """Whether a full placement with this capacity left counts (see 'exact')."""
+        if not self.exact:
+            return True
+        if any(capacity):
+            return False
+        return self.constraints is None or self.constraints.complete_ok()
+
+    def _legal(self, cands: List[Placement], occ: int, capacity: List[int]) -> List[Placement]:
+        return [p for p in cands if self._fits(p, occ, capacity)]
+
+    def _place(self, p: Placement, capacity: List[int]) -> List[int]:
+        capacity = list(capacity)
+        for i, n in self.cost[p.mask]:
+            capacity[i] -= n
+        return capacity
+
+    def iter_solutions(self, rng: Optional[random.Random] = None) -> Iterator[Dict[str, int]]:
+        """Yield {name: mask} for every placement of all shapes (in random order if rng is given)."""
+        assignment: Dict[str, int] = {}
+
+        def backtrack(occ: int, capacity: List[int], cands: Dict[str, List[Placement]]):
+            self.nodes += 1
+            if self.observer is not None:
+                self.observer(self, assignment)
+            if not cands:
+                if self._complete(capacity):
+                    yield dict(assignment)
+                return
+            if not self._can_fill(capacity, cands):
+                self.backtracks += 1
+                return
+            name = min(cands, key=lambda s: len(cands[s]))
+            options = cands[name]
+            if not options:
+                self.backtracks += 1
+                return
+            if rng is not None:
+                options = list(options)
+                rng.shuffle(options)
+            for p in options:
+                occ2 = occ | p.mask
+                cap2 = self._place(p, capacity)
+                child = {}
+                for s, lst in cands.items():
+                    if s == name:
+                        continue
+                    filtered = [q for q in lst if self._fits(q, occ2, cap2)]
+                    if not filtered:
+                        break
+                    child[s] = filtered
+                else:
+                    if self.constraints is None:
+                        assignment[name] = p.mask
+                        yield from backtrack(occ2, cap2, child)
+                        del assignment[name]
+                        continue
+                    if self._accept(p):
+                        assignment[name] = p.mask
+                        try:
+                            yield from backtrack(occ2, cap2, child)
+                        finally:
+                            self.constraints.undo()
+                        del assignment[name]
+                        continue
+                self.backtracks += 1
+
+        yield from backtrack(0, self.capacity, self.candidates)
+
+    def count(self, limit: Optional[int] = None) -> int:
+        """
+        Number of solutions (capped at 'limit'), without materializing them.
+
+        The candidate lists, the remaining capacities and the 2x2 state at a
+        node are all functions of the occupancy mask (and so is the final
+        check of a completion), so the number of completions only depends on
+        (occupancy, remaining shapes): distinct
+        partial placements with the same union share one memo entry. Counts
+        truncated by 'limit' are not memoized.
+        """
+        memo: Dict[Tuple[int, Tuple[str, ...]], int] = {}
+        cap = float("inf") if limit is None else limit
+
+        def count(occ: int, capacity: List[int], cands: Dict[str, List[Placement]], need) -> int:
+            self.nodes += 1
+            if not cands:
+                return 1 if self._complete(capacity) else 0
+            if not self._can_fill(capacity, cands):
+                return 0
+            if len(cands) == 1:
+                # every candidate left for the last shape is a completion (if it completes the grid)
+                last = next(iter(cands.values()))
+                if self.constraints is None and not self.exact:
+                    return len(last)
+                total = 0
+                for p in last:
+                    cap2 = self._place(p, capacity)
+                    if self.exact and any(cap2):
+                        continue
+                    if self.constraints is None:
+                        total += 1
+                    elif self._accept(p):
+                        if self._complete(cap2):
+                            total += 1
+                        self.constraints.undo()
+                return total
+            key = (occ, tuple(sorted(cands)))
+            hit = memo.get(key)
+            if hit is not None:
+                return hit
+            name = min(cands, key=lambda s: len(cands[s]))
+            total = 0
+            for p in cands[name]:
+                occ2 = occ | p.mask
+                cap2 = self._place(p, capacity)
+                child = {}
+                for s, lst in cands.items():
+                    if s == name:
+                        continue
+                    filtered = [q for q in lst if self._fits(q, occ2, cap2)]
+                    if not filtered:
+                        break
+                    child[s] = filtered
+                else:
+                    if self.constraints is None:
+                        total += count(occ2, cap2, child, need - total)
+                    elif self._accept(p):
+                        total += count(occ2, cap2, child, need - total)
+                        self.constraints.undo()
+                    else:
+                        self.backtracks += 1
+                        continue
+                    if total >= need:
+                        return total
+                    continue
+                self.backtracks += 1
+            memo[key] = total
+            return total
+
+        if any(not cands for cands in self.candidates.values()):
+            return 0
+        total = count(0, self.capacity, self.candidates, cap)
+        return total if limit is None else min(total, limit)
@@ -0,0 +1,200 @@
+"""
+Compact board format and append-only transition logs for HooksBoard states.
+
+Binary board: b"HKB1", one size byte, then three bytes per cell in row-major
+order:
+  color   index into COLOR_CHOICES
+  digit   the digit, or 0xFF for an empty cell
+  flags   bits 0-3 bold sides (top, right, bottom, left), bit 4 red digit,
+          bit 5 locked
+
+Transition log (JSONL, one record per line, only ever appended to):
+  {"step": n, "key": "<base64 cells>", "label": ...}          keyframe
+  {"step": n, "delta": [[cell, color, digit, flags], ...], "label": ...}
+A keyframe is written every 'keyframe_every' steps, so replaying step n
+touches at most that many deltas.
+"""
+from typing import Dict, List, Optional
+import argparse
+import base64
+import json
+
+from hooks_engine import GRID_SIZE, HooksBoard, iter_placements
+
+MAGIC = b"HKB1"
+EMPTY_DIGIT = 0xFF
+
+
+def pack_cells(board: HooksBoard) -> bytes:
+    """The three bytes per cell described above (no header)."""
+    size = len(board.colors)
+    out = bytearray(3 * size * size)
+    i = 0
+    for r in range(size):
+        for c in range(size):
+            t, rgt, btm, lft = board.sides[r][c]
+            digit = board.digits[r][c]
+            out[i] = board.colors[r][c]
+            out[i + 1] = int(digit) if digit != "" else EMPTY_DIGIT
+            out[i + 2] = (bool(t) | bool(rgt) << 1 | bool(btm) << 2 | bool(lft) << 3
+                          | (board.num_color[r][c] == 1) << 4 | bool(board.locked[r][c]) << 5)
+            i += 3
+    return bytes(out)
+
+
+def unpack_cells(cells: bytes, board: HooksBoard):
+    """Write packed cells into an existing board (in place, so views of it stay valid)."""
+    size = len(board.colors)
+    if len(cells) != 3 * size * size:
+        raise ValueError(f"Expected {3 * size * size} cell bytes, got {len(cells)}")
+    i = 0
+    for r in range(size):
+        for c in range(size):
+            color, digit, flags = cells[i], cells[i + 1], cells[i + 2]
+            board.colors[r][c] = color
+            board.digits[r][c] = "" if digit == EMPTY_DIGIT else str(digit)
+            board.sides[r][c] = [bool(flags & 1), bool(flags & 2), bool(flags & 4), bool(flags & 8)]
+            board.num_color[r][c] = 1 if flags & 16 else 0
+            board.locked[r][c] = bool(flags & 32)
+            i += 3
+    board.one_pos = board.find_one_position()
+    board.core_L_cells = None
+
+
+def encode_board(board: HooksBoard) -> bytes:
+    return MAGIC + bytes([len(board.colors)]) + pack_cells(board)
+
+
+def decode_board(data: bytes, board: Optional[HooksBoard] = None) -> HooksBoard:
+    """Decode into 'board' (or a fresh HooksBoard)."""
+    if data[:4] != MAGIC:
+        raise ValueError("Not a Hooks board file")
+    board = board if board is not None else HooksBoard()
+    if data[4] != len(board.colors):
+        raise ValueError(f"Board size {data[4]} does not match {len(board.colors)}")
+    unpack_cells(data[5:], board)
+    return board
+
+
+def save_board(board: HooksBoard, path: str):
+    with open(path, "wb") as f:
+        f.write(encode_board(board))
+
+
+def load_board(path: str, board: Optional[HooksBoard] = None) -> HooksBoard:
+    with open(path, "rb") as f:
+        return decode_board(f.read(), board)
+
+
+class TransitionLog:
+    """Appends board states to a JSONL log as keyframes and per-cell deltas."""
+
+    def __init__(self, path: str, keyframe_every: int = 256):
+        try:
+            with open(path) as f:
+                existing = sum(1 for line in f if line.strip())
+        except FileNotFoundError:
+            existing = 0
+        self.f = open(path, "a")
+        self.keyframe_every = keyframe_every
+        self.step = existing  # appending to a log continues its numbering
+        self.last: Optional[bytes] = None  # the first record of each session is a keyframe
+
+    def append(self, board: HooksBoard, label=None):
+        cells = pack_cells(board)
+        record: Dict = {"step": self.step}
+        if self.last is None or self.step % self.keyframe_every == 0:
+            record["key"] = base64.b64encode(cells).decode("ascii")
+        else:
+            last = self.last
+            record["delta"] = [
+                [i // 3, cells[i], cells[i + 1], cells[i + 2]]
+                for i in range(0, len(cells), 3) if cells[i:i + 3] != last[i:i + 3]
+            ]
+        if label is not None:
+            record["label"] = label
+        self.f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self.last = cells
+        self.step += 1
+
+    def close(self):
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class LogReplay:
+    """Random access to the states of a transition log, e.g. for scrubbing in the editor."""
+
+    def __init__(self, path: str):
+        with open(path) as f:
+            self.records = [json.loads(line) for line in f if line.strip()]
+        if not self.records:
+            raise ValueError(f"Log {path} is empty")
+        # index of the latest keyframe at or before each step
+        self.keyframe_of: List[int] = []
+        key = None
+        for i, record in enumerate(self.records):
+            if "key" in record:
+                key = i
+            if key is None:
+                raise ValueError("Log does not start with a keyframe")
+            self.keyframe_of.append(key)
+
+    def __len__(self):
+        return len(self.records)
+
+    def cells(self, step: int) -> bytes:
+        """Packed cells of the board after 'step'."""
+        start = self.keyframe_of[step]
+        cells = bytearray(base64.b64decode(self.records[start]["key"]))
+        for record in self.records[start + 1:step + 1]:
+            for cell, color, digit, flags in record["delta"]:
+                cells[3 * cell:3 * cell + 3] = bytes((color, digit, flags))
+        return bytes(cells)
+
+    def label(self, step: int):
+        return self.records[step].get("label")
+
+    def apply(self, step: int, board: HooksBoard):
+        unpack_cells(self.cells(step), board)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write or inspect Hooks board transition logs.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    trace = sub.add_parser("trace", help="log the exhaustive search's placements, one state per placement")
+    trace.add_argument("path")
+    trace.add_argument("--limit", type=int, default=1000)
+    trace.add_argument("--keyframe-every", type=int, default=256)
+    show = sub.add_parser("show", help="print one state of a log")
+    show.add_argument("path")
+    show.add_argument("--step", type=int, default=-1)
+    args = parser.parse_args()
+
+    if args.command == "trace":
+        board = HooksBoard()
+        with TransitionLog(args.path, args.keyframe_every) as log:
+            for n, placement in enumerate(iter_placements(limit=args.limit)):
+                board.apply_placement(placement)
+                log.append(board, label=f"placement {n + 1}")
+        return
+
+    try:
+        replay = LogReplay(args.path)
+    except ValueError as e:
+        parser.error(str(e))
+    step = args.step % len(replay)
+    board = HooksBoard()
+    replay.apply(step, board)
+    print(f"step {step} of {len(replay)}: {replay.label(step)}")
+    for r in range(GRID_SIZE):
+        print(" ".join(board.digits[r][c] or "." for c in range(GRID_SIZE)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Incremental constraint state for the Hooks grid.
+
+Tracks, under place/undo of filled cells:
+  * the fill count of every 2x2 window (and how many are completely filled),
+  * the number of filled cells in every hook against its digit,
+  * connectivity of the unfilled (or, alternatively, the filled) cells by
+    bitmask flood fill.
+
+Masks use the hooks_bitboard layout (cell (r, c) is bit r * size + c).
+place() and undo() are O(cells placed); ok() is the pruning test for
+partial states and complete_ok() the full check for a finished grid.
+"""
+from typing import List, Optional, Sequence, Tuple
+
+from hooks_bitboard import cell_bit, mask_to_cells
+
+GRID_SIZE = 9
+
+
+class HooksConstraints:
+    """
+    'connected' selects which cells must form one orthogonally connected
+    region: "unfilled" (default), "filled" or None.
+
+    Pruning on partial states is sound: a full 2x2 window or an overfull
+    hook is final. For "unfilled", a split region is only dead if no single
+    component can survive, i.e. if for every component the cells of all
+    the others cannot be filled within the hooks' remaining capacities.
+    Filled cells can still join up later, so "filled" connectivity is only
+    checked by complete_ok().
+    """
+
+    def __init__(
+        self,
+        hook_masks: Sequence[int],
+        hook_digits: Sequence[int],
+        size: int = GRID_SIZE,
+        fixed: int = 0,
+        connected: Optional[str] = "unfilled",
+    ):
+        if connected not in ("unfilled", "filled", None):
+            raise ValueError(f"Unknown connectivity mode: {connected}")
+        self.size = size
+        self.hook_masks = list(hook_masks)
+        self.hook_digits = list(hook_digits)
+        self.connected = connected
+        self.board = (1 << (size * size)) - 1
+        col0 = sum(cell_bit(r, 0, size) for r in range(size))
+        self.not_first_col = self.board & ~col0
+        self.not_last_col = self.board & ~(col0 << (size - 1))
+
+        # per cell: indices of its 2x2 windows and of its hook
+        self.windows: List[int] = []
+        self.cell_windows: List[List[int]] = [[] for _ in range(size * size)]
+        for r in range(size - 1):
+            for c in range(size - 1):
+                cells = ((r, c), (r + 1, c), (r, c + 1), (r + 1, c + 1))
+                for rr, cc in cells:
+                    self.cell_windows[rr * size + cc].append(len(self.windows))
+                self.windows.append(sum(cell_bit(rr, cc, size) for rr, cc in cells))
+        self.cell_hook = [-1] * (size * size)
+        for i, mask in enumerate(self.hook_masks):
+            for r, c in mask_to_cells(mask, size):
+                self.cell_hook[r * size + c] = i
+
+        self.filled = 0
+        self.window_count = [0] * len(self.windows)
+        self.full_windows = 0
+        self.hook_count = [0] * len(self.hook_masks)
+        self.overfull_hooks = 0
+        self.history: List[int] = []
+        self._add(fixed)
+        self.history.clear()
+
+    # ---- place / undo ----
+    def _add(self, new: int):
+        self.filled |= new
+        self.history.append(new)
+        bits = new
+        while bits:
+            low = bits & -bits
+            idx = low.bit_length() - 1
+            for w in self.cell_windows[idx]:
+                self.window_count[w] += 1
+                if self.window_count[w] == 4:
+                    self.full_windows += 1
+            h = self.cell_hook[idx]
+            if h >= 0:
+                self.hook_count[h] += 1
+                if self.hook_count[h] == self.hook_digits[h] + 1:
+                    self.overfull_hooks += 1
+            bits ^= low
+
+    def place(self, mask: int):
+        """Fill the cells of 'mask' (cells already filled are ignored)."""
+        self._add(mask & ~self.filled)
+
+    def undo(self):
+        """Revert the most recent place()."""
+        new = self.history.pop()
+        self.filled &= ~new
+        bits = new
+        while bits:
+            low = bits & -bits
+            idx = low.bit_length() - 1
+            for w in self.cell_windows[idx]:
+                if self.window_count[w] == 4:
+                    self.full_windows -= 1
+                self.window_count[w] -= 1
+            h = self.cell_hook[idx]
+            if h >= 0:
+                if self.hook_count[h] == self.hook_digits[h] + 1:
+                    self.overfull_hooks -= 1
+                self.hook_count[h] -= 1
+            bits ^= low
+
+    # ---- connectivity ----
+    def flood(self, seed: int, region: int) -> int:
+        """Cells of 'region' orthogonally reachable from 'seed' (a single bit of region)."""
+        size = self.size
+        reached = seed
+        while True:
+            grown = (reached
+                     | ((reached << 1) & self.not_first_col)
+                     | ((reached >> 1) & self.not_last_col)
+                     | (reached << size)
+                     | (reached >> size)) & region
+            if grown == reached:
+                return reached
+            reached = grown
+
+    def components(self, region: int) -> List[int]:
+        comps = []
+        while region:
+            comp = self.flood(region & -region, region)
+            comps.append(comp)
+            region &= ~comp
+        return comps
+
+    def unfilled(self) -> int:
+        return self.board & ~self.filled
+
+    def remaining_capacity(self) -> List[int]:
+        return [d - n for d, n in zip(self.hook_digits, self.hook_count)]
+
+    def _unfilled_can_connect(self) -> bool:
+        comps = self.components(self.unfilled())
+        if len(comps) <= 1:
+            return True
+        capacity = self.remaining_capacity()
+        everything = self.unfilled()
+        for survivor in comps:
+            rest = everything & ~survivor
+            if all((rest & mask).bit_count() <= cap for mask, cap in zip(self.hook_masks, capacity)):
+                return True
+        return False
+
+    # ---- checks ----
+    def ok(self) -> bool:
+        """False if no completion of the current partial state can satisfy the constraints."""
+        if self.full_windows or self.overfull_hooks:
+            return False
+        if self.connected == "unfilled":
+            return self._unfilled_can_connect()
+        return True
+
+    def complete_ok(self) -> bool:
+        """Full check of a finished grid: every hook holds exactly its digit's worth of filled cells."""
+        if self.full_windows or self.hook_count != self.hook_digits:
+            return False
+        if self.connected == "unfilled":
+            return len(self.components(self.unfilled())) <= 1
+        if self.connected == "filled":
+            return len(self.components(self.filled)) <= 1
+        return True
+
+
+def from_board(board, hooks: Sequence[Sequence[Tuple[int, int]]], hook_digits: Sequence[int],
+               connected: Optional[str] = "unfilled") -> HooksConstraints:
+    """
+    Constraint state for a HooksBoard: a cell counts as filled if it holds a
+    digit or has a non-white background (a placed pentomino).
+    """
+    size = len(board.digits)
+    hook_masks = [sum(cell_bit(r, c, size) for r, c in cells) for cells in hooks]
+    filled = 0
+    for r in range(size):
+        for c in range(size):
+            if board.digits[r][c] != "" or board.colors[r][c] != 0:
+                filled |= cell_bit(r, c, size)
+    return HooksConstraints(hook_masks, hook_digits, size, filled, connected)
@@ -0,0 +1,219 @@
+"""
+Solution counting and uniqueness checks for Hooks 11 instances.
+
+A solution is a (hook layout, hook digits, pentomino placement) triple in
+which the givens sit in the hooks of their digits, every pentomino meets its
+row target, no 2x2 window is completely filled, every hook holds exactly its
+digit's worth of filled cells and the unfilled cells form one orthogonally
+connected region. The filled cells are the givens and the pentomino cells
+(as in hooks_constraints.from_board); the exact counts and connectivity are
+checked on every complete placement with HooksConstraints.complete_ok, and
+branches whose remaining pieces cannot reach the exact counts are cut early.
+With relaxed=True the count is instead that of the hooks_engine placements
+(hook capacity "at most digit", no connectivity), an upper bound.
+
+An instance can therefore only be represented if its shapes and givens can
+make up all 1 + 2 + ... + n filled cells of the n x n grid; for any other,
+count_solutions and is_uniquely_solvable raise ValueError rather than
+report a count of 0. The shipped GIVENS and PENTOMINO_ROW_TARGETS are such
+an instance (six clued pentominoes, at most 35 of the 45 filled cells): the
+puzzle's filled cells outside the clued pentominoes are not part of this
+model, so only --relaxed counts it. Smaller grids ('size') with their own
+'row_targets' are counted under the full rules.
+
+The search space is split by the first hook around the '1' (the width-2 L,
+one of HooksBoard.available_L_shapes) and the parts are counted on worker
+processes. Symmetry breaking: a rotation/reflection of the grid that maps
+the givens onto themselves and keeps every pentomino's target row maps
+solutions to solutions, so only one first-hook orientation per orbit is
+counted and weighted by the orbit size. The shipped instance's only such
+symmetry is the identity, so there the split only serves to parallelize.
+Within a part, placements are counted with PlacementSearch.count (memoized
+on the occupancy mask).
+"""
+from multiprocessing import Pool, cpu_count
+from typing import Callable, Dict, FrozenSet, Iterator, List, Optional, Tuple
+import argparse
+import time
+
+from hooks_engine import (
+    GIVENS, GRID_SIZE, PENTOMINO_ROW_TARGETS, Cell, HooksBoard, HooksPlacement, count_piece_placements,
+    enumerate_hook_digits, enumerate_hook_layouts, iter_piece_placements,
+)
+
+# Grid symmetries that map rows to rows (the only ones that can keep row targets)
+ROW_SYMMETRIES: Dict[str, Callable[[int, int, int], Cell]] = {
+    "id": lambda r, c, n: (r, c),
+    "flip_v": lambda r, c, n: (r, n - 1 - c),
+    "flip_h": lambda r, c, n: (n - 1 - r, c),
+    "rot180": lambda r, c, n: (n - 1 - r, n - 1 - c),
+}
+
+
+def instance_symmetries(givens=GIVENS, row_targets=PENTOMINO_ROW_TARGETS, size: int = GRID_SIZE) -> List[str]:
+    """Names of the ROW_SYMMETRIES that map the instance onto itself."""
+    found = []
+    for name, f in ROW_SYMMETRIES.items():
+        if {f(r, c, size): d for (r, c), d in givens.items()} != dict(givens):
+            continue
+        if any(f(t, 0, size)[0] != t for t in row_targets.values()):
+            continue
+        found.append(name)
+    return found
+
+
+def first_hook_orbits(givens=GIVENS, row_targets=PENTOMINO_ROW_TARGETS,
+                      size: int = GRID_SIZE) -> List[Tuple[FrozenSet[Cell], int]]:
+    """
+    (representative first hook, orbit size) for each orbit of the width-2
+    hooks around the '1' under the instance's symmetries.
+    """
+    board = HooksBoard(givens)
+    symmetries = [ROW_SYMMETRIES[name] for name in instance_symmetries(givens, row_targets, size)]
+    orbits: Dict[FrozenSet[Cell], int] = {}
+    for cells in board.available_L_shapes():
+        if not all(0 <= r < size and 0 <= c < size for r, c in cells):
+            continue
+        images = {frozenset(f(r, c, size) for r, c in cells) for f in symmetries}
+        rep = min(images, key=sorted)
+        orbits[rep] = len(images)
+    return sorted(orbits.items(), key=lambda item: sorted(item[0]))
+
+
+def check_representable(givens=GIVENS, shapes=tuple(PENTOMINO_ROW_TARGETS), size: int = GRID_SIZE):
+    """Raise ValueError if the givens and shapes cannot make up every filled cell the digits call for."""
+    needed = size * (size + 1) // 2
+    fillable = len(givens) + 5 * len(shapes)
+    if fillable < needed:
+        raise ValueError(
+            f"The digits 1..{size} need {needed} filled cells, but the {len(givens)} givens and "
+            f"{len(shapes)} pentominoes fill at most {fillable}; filled cells outside the pentominoes "
+            f"are not modelled, so this instance cannot be counted under the full rules"
+        )
+
+
+def count_with_first_hook(first_hook: FrozenSet[Cell], givens=GIVENS, shapes=tuple(PENTOMINO_ROW_TARGETS),
+                          limit: Optional[int] = None, relaxed: bool = False,
+                          row_targets=PENTOMINO_ROW_TARGETS, size: int = GRID_SIZE) -> int:
+    """Solutions (or relaxed placements) whose width-2 hook is 'first_hook' (capped at 'limit')."""
+    one_pos = next(cell for cell, d in givens.items() if d == 1)
+    total = 0
+    for hooks in enumerate_hook_layouts(one_pos, size):
+        if hooks[1] != first_hook:
+            continue
+        for hook_digits in enumerate_hook_digits(hooks, givens):
+            remaining = None if limit is None else limit - total
+            total += count_piece_placements(hooks, hook_digits, shapes, givens, remaining,
+                                            full_rules=not relaxed, row_targets=row_targets, size=size)
+            if limit is not None and total >= limit:
+                return limit
+    return total
+
+
+def _count_job(job) -> Tuple[FrozenSet[Cell], int, int]:
+    first_hook, weight, givens, shapes, limit, relaxed, row_targets, size = job
+    return first_hook, weight, count_with_first_hook(first_hook, givens, shapes, limit, relaxed, row_targets, size)
+
+
+def iter_solutions(givens=GIVENS, shapes=tuple(PENTOMINO_ROW_TARGETS), row_targets=PENTOMINO_ROW_TARGETS,
+                   size: int = GRID_SIZE) -> Iterator[HooksPlacement]:
+    """
+    Every solution under the full rules, one at a time and without symmetry
+    breaking; raises ValueError if the instance cannot be represented.
+    """
+    check_representable(givens, shapes, size)
+    one_pos = next((cell for cell, d in givens.items() if d == 1), None)
+    if one_pos is None:
+        return
+    for hooks in enumerate_hook_layouts(one_pos, size):
+        for hook_digits in enumerate_hook_digits(hooks, givens):
+            for pieces in iter_piece_placements(hooks, hook_digits, shapes, givens, full_rules=True,
+                                                row_targets=row_targets, size=size):
+                yield HooksPlacement(hooks, hook_digits, pieces)
+
+
+def count_solutions(givens=GIVENS, shapes=tuple(PENTOMINO_ROW_TARGETS), limit: Optional[int] = None,
+                    workers: Optional[int] = None, progress: Optional[Callable] = None,
+                    relaxed: bool = False, row_targets=PENTOMINO_ROW_TARGETS, size: int = GRID_SIZE) -> int:
+    """
+    Number of solutions of the instance (capped at 'limit'), one worker per
+    first-hook orbit; with relaxed=True, the number of relaxed placements.
+    Raises ValueError if the instance cannot be represented under the full
+    rules (see check_representable).
+    'progress(first_hook, weight, count)' is called as each part finishes.
+    With a limit, the pool is torn down as soon as it is reached.
+    """
+    if not relaxed:
+        check_representable(givens, shapes, size)
+    if not any(d == 1 for d in givens.values()):
+        return 0
+    targets = {name: row_targets[name] for name in shapes}
+    orbits = first_hook_orbits(givens, targets, size)
+    # A part weighted w contributes w * count, so it never needs more than ceil(limit / w)
+    jobs = [(cells, weight, givens, tuple(shapes), None if limit is None else -(-limit // weight), relaxed,
+             targets, size)
+            for cells, weight in orbits]
+    total = 0
+
+    def collect(results):
+        nonlocal total
+        for first_hook, weight, count in results:
+            total += weight * count
+            if progress is not None:
+                progress(first_hook, weight, count)
+            if limit is not None and total >= limit:
+                return True
+        return False
+
+    pool_size = min(workers or max(cpu_count() - 1, 1), len(jobs))
+    if pool_size <= 1:
+        collect(map(_count_job, jobs))
+    else:
+        with Pool(pool_size) as pool:  # leaving the block terminates the remaining jobs
+            collect(pool.imap_unordered(_count_job, jobs))
+    return total if limit is None else min(total, limit)
+
+
+def is_uniquely_solvable(givens=GIVENS, shapes=tuple(PENTOMINO_ROW_TARGETS), workers: Optional[int] = None,
+                         row_targets=PENTOMINO_ROW_TARGETS, size: int = GRID_SIZE) -> bool:
+    """
+    True iff the instance has exactly one solution (stops counting at two);
+    raises ValueError if it cannot be represented (see check_representable).
+    """
+    return count_solutions(givens, shapes, limit=2, workers=workers, row_targets=row_targets, size=size) == 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count the solutions of the Hooks 11 instance.")
+    parser.add_argument("--limit", type=int, default=None, help="stop counting at this many")
+    parser.add_argument("--unique", action="store_true", help="only report whether the solution is unique")
+    parser.add_argument("--relaxed", action="store_true",
+                        help="count hooks_engine's relaxed placements (at most digit per hook, no connectivity)")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    if args.unique and args.relaxed:
+        parser.error("--unique checks the full rules and cannot be combined with --relaxed")
+
+    symmetries = instance_symmetries()
+    print(f"Instance symmetries: {', '.join(symmetries)}")
+    if not args.relaxed:
+        try:
+            check_representable()
+        except ValueError as exc:
+            parser.exit(1, f"{exc}. Use --relaxed to count the relaxed placements.\n")
+    if args.unique:
+        print("unique solution" if is_uniquely_solvable(workers=args.workers) else "not uniquely solvable")
+        return
+
+    def report(first_hook, weight, count):
+        print(f"  first hook {sorted(first_hook)} x{weight}: {count}")
+
+    start = time.perf_counter()
+    total = count_solutions(limit=args.limit, workers=args.workers, progress=report, relaxed=args.relaxed)
+    capped = " (limit reached)" if args.limit is not None and total >= args.limit else ""
+    what = "Relaxed placements" if args.relaxed else "Solutions"
+    print(f"{what}: {total}{capped} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
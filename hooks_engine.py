@@ -0,0 +1,653 @@
+"""
+Headless model and search logic for the Hooks 11 grid.
+
+Nothing here imports tkinter: hooks_solver.GridEditor wraps a HooksBoard and
+only adds drawing and input handling on top, so the hook and pentomino
+searches can also run on servers, in worker processes and in benchmarks.
+"""
+from typing import Dict, FrozenSet, Iterator, NamedTuple, Tuple, List, Set, Optional
+from functools import lru_cache
+import argparse
+import random
+import threading
+
+from hooks_bitboard import (
+    Placement, PlacementSearch, any_full_2x2, cells_to_mask, mask_to_cells, placements_by_row,
+)
+from hooks_constraints import HooksConstraints
+from polyomino_library import orientations, pentomino, placement_masks
+
+GRID_SIZE = 9
+
+# Prefilled non-editable numbers (0-indexed row, col) -> digit
+GIVENS = {
+    (0, 4): 5,
+    (1, 3): 4,
+    (4, 4): 1,
+    (7, 5): 8,
+    (8, 4): 9,
+}
+
+# Fixed color assignment (indices into COLOR_CHOICES) per pentomino
+# These remain constant across button clicks in this session.
+PENTOMINO_COLORS = {
+    "I": 1,  # Neon Yellow
+    "N": 2,  # Electric Lime
+    "Z": 3,  # Electric Cyan
+    "U": 4,  # Hot Pink
+    "X": 5,  # Safety Orange
+    "V": 6,  # Vivid Purple
+}
+
+# Each pentomino must have at least one cell in this row
+PENTOMINO_ROW_TARGETS = {"I": 0, "N": 5, "Z": 8, "U": 0, "X": 3, "V": 8}
+
+
+class HooksBoard:
+    """Pure data model of the editor grid plus the hook/pentomino generators."""
+
+    def __init__(self, givens=GIVENS):
+        self.colors = [[0 for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]  # index into COLOR_CHOICES
+        self.digits = [["" for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]  # "", "0".."9"
+        # sides[r][c] = [top, right, bottom, left] booleans
+        self.sides = [[[False, False, False, False] for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+        # number color: 0 = black, 1 = red
+        self.num_color = [[0 for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+        # locked (non-editable) cells
+        self.locked = [[False for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+        for (r, c), d in givens.items():
+            if 0 <= r < GRID_SIZE and 0 <= c < GRID_SIZE and 0 <= d <= 9:
+                self.digits[r][c] = str(d)
+                self.locked[r][c] = True
+                self.num_color[r][c] = 0  # force black for givens
+
+        # position of the '1'
+        self.one_pos = self.find_one_position()
+        self.ensure_one_bold()
+
+        # track the 3-cell L around '1'
+        self.core_L_cells: Optional[Set[Tuple[int, int]]] = None
+
+    # ---- helpers ----
+    def find_one_position(self) -> Optional[Tuple[int, int]]:
+        for r in range(GRID_SIZE):
+            for c in range(GRID_SIZE):
+                if self.digits[r][c] == "1":
+                    return (r, c)
+        return None
+
+    def ensure_one_bold(self):
+        if getattr(self, 'one_pos', None) is not None:
+            r1, c1 = self.one_pos
+            self.sides[r1][c1] = [True, True, True, True]
+
+    def clear_sides(self):
+        for r in range(GRID_SIZE):
+            for c in range(GRID_SIZE):
+                self.sides[r][c] = [False, False, False, False]
+
+    def clear_colors(self):
+        for r in range(GRID_SIZE):
+            for c in range(GRID_SIZE):
+                self.colors[r][c] = 0  # White
+
+    # ---- 3-cell L (around '1') ----
+    def available_L_shapes(self) -> List[Set[Tuple[int,int]]]:
+        """Return list of 3-cell L sets touching the '1' cell, within bounds."""
+        res: List[Set[Tuple[int,int]]] = []
+        if self.one_pos is None:
+            return res
+        r, c = self.one_pos
+        orientations = [
+            { (r-1, c), (r, c-1), (r-1, c-1) },  # NW
+            { (r-1, c), (r, c+1), (r-1, c+1) },  # NE
+            { (r+1, c), (r, c-1), (r+1, c-1) },  # SW
+            { (r+1, c), (r, c+1), (r+1, c+1) },  # SE
+        ]
+        for cells in orientations:
+            ok = True
+            for (rr, cc) in cells:
+                if not (0 <= rr < GRID_SIZE and 0 <= cc < GRID_SIZE):
+                    ok = False
+                    break
+            if ok:
+                res.append(cells)
+        return res
+
+    def core_block4(self) -> Optional[Set[Tuple[int,int]]]:
+        """Return the 4-cell square: the '1' cell plus the chosen 3-cell L."""
+        if self.one_pos is None or self.core_L_cells is None:
+            return None
+        block = set(self.core_L_cells)
+        block.add(self.one_pos)
+        return block
+
+    def core_orientation(self) -> Optional[str]:
+        """Return 'NW','NE','SW','SE' for the 3-cell L relative to the '1' cell."""
+        if self.one_pos is None or self.core_L_cells is None:
+            return None
+        r, c = self.one_pos
+        cells = self.core_L_cells
+        if {(r-1, c), (r, c-1), (r-1, c-1)}.issubset(cells):
+            return "NW"
+        if {(r-1, c), (r, c+1), (r-1, c+1)}.issubset(cells):
+            return "NE"
+        if {(r+1, c), (r, c-1), (r+1, c-1)}.issubset(cells):
+            return "SW"
+        if {(r+1, c), (r, c+1), (r+1, c+1)}.issubset(cells):
+            return "SE"
+        return None
+
+    def complement_L_cells(self, orient: str) -> Optional[Set[Tuple[int,int]]]:
+        """Return the 5-cell '3x3-L' that complements the 2x2 block to make a 3x3 (in spirit)."""
+        if self.one_pos is None or self.core_L_cells is None:
+            return None
+        r, c = self.one_pos
+        if orient == "NW":
+            R = range(r-2, r+1)
+            C = range(c-2, c+1)
+            block2x2 = {(r-1, c-1), (r-1, c), (r, c-1), (r, c)}
+        elif orient == "NE":
+            R = range(r-2, r+1)
+            C = range(c, c+3)
+            block2x2 = {(r-1, c), (r-1, c+1), (r, c), (r, c+1)}
+        elif orient == "SW":
+            R = range(r, r+3)
+            C = range(c-2, c+1)
+            block2x2 = {(r, c-1), (r, c), (r+1, c-1), (r+1, c)}
+        elif orient == "SE":
+            R = range(r, r+3)
+            C = range(c, c+3)
+            block2x2 = {(r, c), (r, c+1), (r+1, c), (r+1, c+1)}
+        else:
+            return None
+
+        for rr in R:
+            for cc in C:
+                if not (0 <= rr < GRID_SIZE and 0 <= cc < GRID_SIZE):
+                    return None
+
+        region = {(rr, cc) for rr in R for cc in C}
+        comp = region - block2x2
+        if len(comp) != 5:
+            return None
+        return comp
+
+    def outline_cells(self, cells: Set[Tuple[int,int]]):
+        """Set bold sides outlining the union of cells (no internal bold lines).
+           NOTE: This clears previous sides (except keeps '1' bold)."""
+        self.clear_sides()
+        self.add_outline_cells(cells)
+
+    def add_outline_cells(self, cells: Set[Tuple[int,int]]):
+        """Add bold sides outlining given cells on top of existing sides (no clearing)."""
+        cells_set = set(cells)
+        for (r, c) in cells_set:
+            if r-1 < 0 or (r-1, c) not in cells_set:
+                self.sides[r][c][0] = True
+            if c+1 >= GRID_SIZE or (r, c+1) not in cells_set:
+                self.sides[r][c][1] = True
+            if r+1 >= GRID_SIZE or (r+1, c) not in cells_set:
+                self.sides[r][c][2] = True
+            if c-1 < 0 or (r, c-1) not in cells_set:
+                self.sides[r][c][3] = True
+
+    # ---- Single-click: core + complementary 5-cell L ----
+    def generate_core_and_complement(self, rng=random) -> bool:
+        """Place a random 3-cell L touching '1', then independently choose one of
+        the four possible 3×3 placements whose complement (5-cell L) plus the 2×2 block fills that 3×3,
+        and keep growing nested hooks out to 9×9.
+        Returns False if no 3-cell L fits around the '1'."""
+        options = self.available_L_shapes()
+        if not options:
+            return False
+        core_choice = rng.choice(options)
+        self.core_L_cells = set(core_choice)
+
+        self.clear_sides()
+        self.ensure_one_bold()
+        self.add_outline_cells(self.core_L_cells)
+
+        if self.one_pos is None:
+            self.one_pos = self.find_one_position()
+        if self.one_pos is None:
+            return True
+        block4 = set(self.core_L_cells)
+        block4.add(self.one_pos)
+
+        min_r = min(r for r, _ in block4)
+        min_c = min(c for _, c in block4)
+
+        tl_candidates = [
+            (min_r,     min_c),
+            (min_r,     min_c - 1),
+            (min_r - 1, min_c),
+            (min_r - 1, min_c - 1),
+        ]
+
+        valid_tl = []
+        for tr, tc in tl_candidates:
+            if 0 <= tr <= GRID_SIZE - 3 and 0 <= tc <= GRID_SIZE - 3:
+                valid_tl.append((tr, tc))
+        if not valid_tl:
+            return True
+
+        tr, tc = rng.choice(valid_tl)
+        region = {(rr, cc) for rr in range(tr, tr+3) for cc in range(tc, tc+3)}
+        comp = region - block4
+        if len(comp) != 5:
+            others = [tl for tl in valid_tl if tl != (tr, tc)]
+            for tr2, tc2 in others:
+                region2 = {(rr, cc) for rr in range(tr2, tr2+3) for cc in range(tc2, tc2+3)}
+                comp2 = region2 - block4
+                if len(comp2) == 5:
+                    comp = comp2
+                    tr, tc = tr2, tc2
+                    break
+            else:
+                return True
+
+        self.add_outline_cells(comp)
+
+        tl4_candidates = [
+            (tr,     tc),
+            (tr-1,   tc),
+            (tr,     tc-1),
+            (tr-1,   tc-1),
+        ]
+        tl4_valid = [(r4, c4) for (r4, c4) in tl4_candidates if 0 <= r4 <= GRID_SIZE-4 and 0 <= c4 <= GRID_SIZE-4]
+        if tl4_valid:
+            r4, c4 = rng.choice(tl4_valid)
+            region4 = {(rr, cc) for rr in range(r4, r4+4) for cc in range(c4, c4+4)}
+            l7 = region4 - region
+            if len(l7) == 7:
+                self.add_outline_cells(l7)
+
+        tl5_candidates = [
+            (r4,   c4),
+            (r4-1, c4),
+            (r4,   c4-1),
+            (r4-1, c4-1),
+        ]
+        tl5_valid = [(r5, c5) for (r5, c5) in tl5_candidates if 0 <= r5 <= GRID_SIZE-5 and 0 <= c5 <= GRID_SIZE-5]
+        if tl5_valid:
+            r5, c5 = rng.choice(tl5_valid)
+            region5 = {(rr, cc) for rr in range(r5, r5+5) for cc in range(c5, c5+5)}
+            l9 = region5 - region4
+            if len(l9) == 9:
+                self.add_outline_cells(l9)
+
+        tl6_candidates = [
+            (r5,   c5),
+            (r5-1, c5),
+            (r5,   c5-1),
+            (r5-1, c5-1),
+        ]
+        tl6_valid = [(r6, c6) for (r6, c6) in tl6_candidates if 0 <= r6 <= GRID_SIZE-6 and 0 <= c6 <= GRID_SIZE-6]
+        if tl6_valid:
+            r6, c6 = rng.choice(tl6_valid)
+            region6 = {(rr, cc) for rr in range(r6, r6+6) for cc in range(c6, c6+6)}
+            l11 = region6 - region5
+            if len(l11) == 11:
+                self.add_outline_cells(l11)
+
+        tl7_candidates = [
+            (r6,   c6),
+            (r6-1, c6),
+            (r6,   c6-1),
+            (r6-1, c6-1),
+        ]
+        tl7_valid = [(r7, c7) for (r7, c7) in tl7_candidates if 0 <= r7 <= GRID_SIZE-7 and 0 <= c7 <= GRID_SIZE-7]
+        if tl7_valid:
+            r7, c7 = rng.choice(tl7_valid)
+            region7 = {(rr, cc) for rr in range(r7, r7+7) for cc in range(c7, c7+7)}
+            l13 = region7 - region6
+            if len(l13) == 13:
+                self.add_outline_cells(l13)
+
+        tl8_candidates = [
+            (r7,   c7),
+            (r7-1, c7),
+            (r7,   c7-1),
+            (r7-1, c7-1),
+        ] if 'r7' in locals() else []
+        tl8_valid = [(r8, c8) for (r8, c8) in tl8_candidates if 0 <= r8 <= GRID_SIZE-8 and 0 <= c8 <= GRID_SIZE-8]
+        if tl8_valid:
+            r8, c8 = rng.choice(tl8_valid)
+            region8 = {(rr, cc) for rr in range(r8, r8+8) for cc in range(c8, c8+8)}
+            l15 = region8 - region7
+            if len(l15) == 15:
+                self.add_outline_cells(l15)
+
+        tl9_candidates = [
+            (r8,   c8),
+            (r8-1, c8),
+            (r8,   c8-1),
+            (r8-1, c8-1),
+        ] if 'r8' in locals() else []
+        tl9_valid = [(r9, c9) for (r9, c9) in tl9_candidates if 0 <= r9 <= GRID_SIZE-9 and 0 <= c9 <= GRID_SIZE-9]
+        if tl9_valid:
+            r9, c9 = rng.choice(tl9_valid)
+            region9 = {(rr, cc) for rr in range(r9, r9+9) for cc in range(c9, c9+9)}
+            l17 = region9 - region8
+            if len(l17) == 17:
+                self.add_outline_cells(l17)
+        return True
+
+    # ---------- Pentomino placement ----------
+    def place_random_pentominoes(self, rng=random) -> bool:
+        """
+        Randomly place pentominoes I, N, Z, U, X, V (5 adjacent cells each)
+        on the 9x9 grid such that each has at least one cell in its row from
+        PENTOMINO_ROW_TARGETS (I: 0, N: 5, Z: 8, U: 0, X: 3, V: 8).
+        Uses background colors only; no changes to digits/sides.
+        Clears all backgrounds first.
+        Additionally enforces: every 2x2 region of the grid must contain at least one white cell.
+        Returns False if no placement was found.
+        """
+        self.clear_colors()
+        assignment = search_pentominoes(PENTOMINO_ROW_TARGETS, rng)
+        if assignment is None:
+            return False
+        self.color_pentominoes(assignment)
+        return True
+
+    def color_pentominoes(self, assignment: Dict[str, Set[Tuple[int,int]]]):
+        """Color the placed shapes using the fixed mapping (other cells are left as they are)."""
+        for name, cells in assignment.items():
+            col_idx = PENTOMINO_COLORS[name]
+            for (r, c) in cells:
+                self.colors[r][c] = col_idx
+
+    def apply_placement(self, placement: "HooksPlacement"):
+        """Outline the placement's hooks, color its pentominoes and fill their cells with hook digits."""
+        self.clear_sides()
+        self.clear_colors()
+        self.ensure_one_bold()
+        for cells in placement.hooks:
+            self.add_outline_cells(cells)
+        for r in range(GRID_SIZE):
+            for c in range(GRID_SIZE):
+                if not self.locked[r][c]:
+                    self.digits[r][c] = ""
+        digit_of = {cell: d for cells, d in zip(placement.hooks, placement.hook_digits) for cell in cells}
+        for name, cells in placement.pieces.items():
+            for (r, c) in cells:
+                self.colors[r][c] = PENTOMINO_COLORS[name]
+                if not self.locked[r][c]:
+                    self.digits[r][c] = str(digit_of[(r, c)])
+
+
+def violates_2x2_all_filled(occ: Set[Tuple[int,int]]) -> bool:
+    """Return True if any 2x2 window is fully occupied (no white cell)."""
+    return any_full_2x2(cells_to_mask(occ, GRID_SIZE), GRID_SIZE)
+
+
+@lru_cache(maxsize=None)
+def row_placements(name: str, row: Optional[int] = None, size: int = GRID_SIZE) -> Tuple[Placement, ...]:
+    """
+    Bitboard placements of a pentomino touching 'row' (default: its target
+    row) on a size x size grid, computed once per shape, row and size.
+    """
+    if row is None:
+        row = PENTOMINO_ROW_TARGETS[name]
+    return placements_by_row(placement_masks(pentomino(name), size), size)[row]
+
+
+def search_pentominoes(shapes, rng=random, observer=None):
+    """
+    Randomized backtracking with MRV (fewest candidates first) for one
+    placement of 'shapes' meeting their row targets and the 2x2 rule.
+    Returns {name: set of cells} or None. 'observer' is passed on to
+    PlacementSearch (see SearchControl for pausing/cancelling from another thread).
+    """
+    search = PlacementSearch({name: row_placements(name) for name in shapes}, GRID_SIZE)
+    search.observer = observer
+    found = next(search.iter_solutions(rng), None)
+    if found is None:
+        return None
+    return {name: mask_to_cells(mask, GRID_SIZE) for name, mask in found.items()}
+
+
+class SearchCancelled(Exception):
+    pass
+
+
+class SearchControl:
+    """
+    Pause/resume/cancel flags shared between a UI thread and a search
+    running on a worker thread. The search calls checkpoint() at every node
+    (e.g. from a PlacementSearch observer): it blocks while paused and
+    raises SearchCancelled once cancel() was called.
+    """
+
+    def __init__(self):
+        self.running = threading.Event()
+        self.running.set()
+        self.cancelled = threading.Event()
+
+    def pause(self):
+        self.running.clear()
+
+    def resume(self):
+        self.running.set()
+
+    def cancel(self):
+        self.cancelled.set()
+        self.running.set()  # wake a paused search so it can stop
+
+    @property
+    def paused(self) -> bool:
+        return not self.running.is_set()
+
+    def checkpoint(self):
+        self.running.wait()
+        if self.cancelled.is_set():
+            raise SearchCancelled()
+
+
+# ---------- Exhaustive search ----------
+# The search below models the hooks, the digits and the clued pentominoes: the givens sit in
+# the hooks of their digits, the pentominoes meet their row targets and the 2x2 rule, and a
+# hook holds at most its digit's worth of filled cells. The puzzle's other rules (exact digit
+# counts, connectivity) are only applied with full_rules=True (see piece_search and
+# hooks_count); without it, what the search yields are candidate placements, not solutions.
+Cell = Tuple[int, int]
+
+
+class HooksPlacement(NamedTuple):
+    hooks: Tuple[FrozenSet[Cell], ...]  # hooks[k-1] holds the 2k-1 cells of the width-k hook
+    hook_digits: Tuple[int, ...]        # digit assigned to each hook
+    pieces: Dict[str, FrozenSet[Cell]]  # pentomino name -> cells
+
+
+def enumerate_hook_layouts(one_pos: Cell, grid_size: int = GRID_SIZE) -> Iterator[Tuple[FrozenSet[Cell], ...]]:
+    """
+    Yield every nested hook layout anchored at the '1': the width-1 hook is
+    the '1' cell, and each k×k square grows to (k+1)×(k+1) by adding a row
+    and a column on one of its four corners, until it covers the grid.
+    """
+    def grow(k, tr, tc, region, hooks):
+        if k == grid_size:
+            yield tuple(hooks)
+            return
+        for nr, nc in ((tr, tc), (tr - 1, tc), (tr, tc - 1), (tr - 1, tc - 1)):
+            if 0 <= nr <= grid_size - k - 1 and 0 <= nc <= grid_size - k - 1:
+                bigger = frozenset((rr, cc) for rr in range(nr, nr + k + 1) for cc in range(nc, nc + k + 1))
+                yield from grow(k + 1, nr, nc, bigger, hooks + [bigger - region])
+
+    r, c = one_pos
+    core = frozenset({(r, c)})
+    yield from grow(1, r, c, core, [core])
+
+
+def enumerate_hook_digits(hooks: Tuple[FrozenSet[Cell], ...], givens=GIVENS) -> Iterator[Tuple[int, ...]]:
+    """
+    Yield every assignment of the digits 1..n (one per hook) such that each
+    given lies in the hook of its digit and no hook gets more filled cells
+    than it has cells (digit <= 2k-1 for the width-k hook).
+    """
+    n = len(hooks)
+    hook_of = {cell: i for i, cells in enumerate(hooks) for cell in cells}
+    fixed: Dict[int, int] = {}
+    for cell, d in givens.items():
+        i = hook_of[cell]
+        if fixed.setdefault(i, d) != d:
+            return
+    if len(set(fixed.values())) != len(fixed):
+        return
+
+    digits = [0] * n
+    used = set(fixed.values())
+
+    def assign(i):
+        if i == n:
+            yield tuple(digits)
+            return
+        if i in fixed:
+            if fixed[i] <= len(hooks[i]):
+                digits[i] = fixed[i]
+                yield from assign(i + 1)
+            return
+        for d in range(1, n + 1):
+            if d not in used and d <= len(hooks[i]):
+                used.add(d)
+                digits[i] = d
+                yield from assign(i + 1)
+                used.discard(d)
+
+    yield from assign(0)
+
+
+def piece_search(hooks, hook_digits, shapes, givens=GIVENS, connected: bool = False,
+                 full_rules: bool = False, row_targets=PENTOMINO_ROW_TARGETS,
+                 size: int = GRID_SIZE) -> Optional[PlacementSearch]:
+    """
+    PlacementSearch for 'shapes' (row targets, no overlaps, 2x2 rule) under
+    a fixed hook layout and digit assignment, or None if the givens already
+    overfill a hook. Pentomino cells are filled cells, so a hook may hold at
+    most its digit's worth of them (givens count against that too).
+    With connected=True, branches after which the unfilled cells can no
+    longer form one region are pruned (see hooks_constraints).
+    With full_rules=True (implies connected), the givens and pentomino cells
+    are all the filled cells: a placement only counts if every hook holds
+    exactly its digit's worth of them and the unfilled cells are connected.
+    Each shape must touch its row in 'row_targets' on the size x size grid.
+    """
+    hook_masks = [cells_to_mask(cells, size) for cells in hooks]
+    fixed = cells_to_mask(givens, size)
+    capacity = [d - (fixed & mask).bit_count() for d, mask in zip(hook_digits, hook_masks)]
+    if min(capacity) < 0:
+        return None
+    if full_rules and sum(capacity) > 5 * len(shapes):
+        return None  # each pentomino fills at most five more cells, too few to reach the digits
+    search = PlacementSearch({name: row_placements(name, row_targets[name], size) for name in shapes},
+                             size, fixed, hook_masks, capacity)
+    if connected or full_rules:
+        search.constraints = HooksConstraints(hook_masks, hook_digits, size, fixed)
+    search.exact = full_rules
+    return search
+
+
+def iter_piece_placements(hooks, hook_digits, shapes, givens=GIVENS, connected: bool = False,
+                          full_rules: bool = False, row_targets=PENTOMINO_ROW_TARGETS,
+                          size: int = GRID_SIZE) -> Iterator[Dict[str, FrozenSet[Cell]]]:
+    """
+    Yield every placement of 'shapes' for a fixed hook layout and digit
+    assignment (see piece_search). Shapes are branched on in fewest-candidates-
+    first order, which is deterministic, so every placement is produced once.
+    """
+    search = piece_search(hooks, hook_digits, shapes, givens, connected, full_rules, row_targets, size)
+    if search is None:
+        return
+    for found in search.iter_solutions():
+        yield {name: _placement_cells(mask, size) for name, mask in found.items()}
+
+
+def count_piece_placements(hooks, hook_digits, shapes, givens=GIVENS, limit: Optional[int] = None,
+                           connected: bool = False, full_rules: bool = False, row_targets=PENTOMINO_ROW_TARGETS,
+                           size: int = GRID_SIZE) -> int:
+    """Number of placements iter_piece_placements would yield (capped at 'limit')."""
+    search = piece_search(hooks, hook_digits, shapes, givens, connected, full_rules, row_targets, size)
+    return 0 if search is None else search.count(limit)
+
+
+@lru_cache(maxsize=None)
+def _placement_cells(mask: int, size: int = GRID_SIZE) -> FrozenSet[Cell]:
+    return frozenset(mask_to_cells(mask, size))
+
+
+def iter_placements(givens=GIVENS, shapes=tuple(PENTOMINO_ROW_TARGETS), limit: Optional[int] = None,
+                    connected: bool = False) -> Iterator[HooksPlacement]:
+    """
+    Deterministically enumerate every (hook layout, hook digits, pentomino
+    placement) consistent with the givens, the row targets, the hook
+    capacities and the 2x2 rule, stopping after 'limit' placements if given.
+    """
+    one_pos = next((cell for cell, d in givens.items() if d == 1), None)
+    if one_pos is None:
+        return
+    found = 0
+    for hooks in enumerate_hook_layouts(one_pos):
+        for hook_digits in enumerate_hook_digits(hooks, givens):
+            for pieces in iter_piece_placements(hooks, hook_digits, shapes, givens, connected):
+                yield HooksPlacement(hooks, hook_digits, pieces)
+                found += 1
+                if limit is not None and found >= limit:
+                    return
+
+
+def count_placements(givens=GIVENS, shapes=tuple(PENTOMINO_ROW_TARGETS), limit: Optional[int] = None,
+                     connected: bool = False) -> int:
+    """
+    Number of placements iter_placements would yield (capped at 'limit').
+    Counts per (layout, digits) without enumerating them; see hooks_count
+    for the parallel version.
+    """
+    one_pos = next((cell for cell, d in givens.items() if d == 1), None)
+    if one_pos is None:
+        return 0
+    total = 0
+    for hooks in enumerate_hook_layouts(one_pos):
+        for hook_digits in enumerate_hook_digits(hooks, givens):
+            remaining = None if limit is None else limit - total
+            total += count_piece_placements(hooks, hook_digits, shapes, givens, remaining, connected)
+            if limit is not None and total >= limit:
+                return total
+    return total
+
+
+# ---- Pentomino geometry helpers ----
+def pentomino_orientations(name):
+    """Return a list of orientations; each orientation is a set of (r,c) with min r=c=0."""
+    return [set(cells) for cells in orientations(pentomino(name))]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Enumerate Hooks 11 placements: hook layouts, hook digits and the clued pentominoes under "
+                    "the relaxed rules (at most digit filled cells per hook, no connectivity). A placement is "
+                    "not a puzzle solution; hooks_count counts solutions for instances the full rules can represent."
+    )
+    parser.add_argument("--count", action="store_true", help="count all placements instead of printing the first")
+    parser.add_argument("--limit", type=int, default=None, help="stop counting after this many placements")
+    parser.add_argument("--connected", action="store_true", help="prune placements that split the unfilled cells")
+    args = parser.parse_args()
+
+    if args.count:
+        print(f"{count_placements(limit=args.limit, connected=args.connected)} placements (relaxed rules, not solutions)")
+        return
+
+    placement = next(iter_placements(connected=args.connected), None)
+    if placement is None:
+        print("No placement")
+        return
+    print("First placement (relaxed rules, not a checked solution):")
+    board = HooksBoard()
+    board.apply_placement(placement)
+    for r in range(GRID_SIZE):
+        print(" ".join(board.digits[r][c] or "." for c in range(GRID_SIZE)))
+
+
+if __name__ == "__main__":
+    main()
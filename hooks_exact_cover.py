@@ -0,0 +1,193 @@
+"""
+Exact-cover (Dancing Links) formulation of the Hooks 11 search.
+
+Hooks: every cell is covered exactly once and every hook width 1..9 is used
+exactly once. Any tiling of the grid by one L of each width is necessarily
+nested, so the exact covers are precisely the hook layouts; the width-1
+hook is pinned to the '1'.
+
+Pentominoes: every clued shape is placed exactly once (primary columns),
+cells are secondary (at most one piece each). With separate=True, pieces
+may not touch orthogonally either: each grid edge is a secondary column
+claimed by every piece that has a cell on exactly one side of it. Hook
+capacities and the 2x2 rule are not at-most-once constraints and are
+checked on partial solutions instead.
+"""
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+import argparse
+
+from dlx import DLX
+from hooks_bitboard import cell_bit, cells_to_mask, mask_to_cells, window_masks
+from hooks_engine import (
+    GIVENS, GRID_SIZE, PENTOMINO_ROW_TARGETS, Cell, HooksPlacement, enumerate_hook_digits, row_placements,
+)
+from polyomino_library import l_hook, placement_masks
+
+
+def hook_tiling_dlx(one_pos: Cell, size: int = GRID_SIZE) -> DLX:
+    cells = [(r, c) for r in range(size) for c in range(size)]
+    dlx = DLX(cells + [("hook", k) for k in range(1, size + 1)])
+    dlx.add_row((1, frozenset({one_pos})), [one_pos, ("hook", 1)])
+    one_bit = cell_bit(*one_pos, size)
+    for k in range(2, size + 1):
+        for mask in placement_masks(l_hook(k), size):
+            if mask & one_bit:
+                continue
+            placed = frozenset(mask_to_cells(mask, size))
+            dlx.add_row((k, placed), sorted(placed) + [("hook", k)])
+    return dlx
+
+
+def iter_hook_layouts(one_pos: Cell, size: int = GRID_SIZE) -> Iterator[Tuple[FrozenSet[Cell], ...]]:
+    """Every hook layout, as hooks[k-1] = cells of the width-k hook."""
+    for rows in hook_tiling_dlx(one_pos, size).iter_solutions():
+        yield tuple(cells for _, cells in sorted(rows, key=lambda row: row[0]))
+
+
+def _edge_columns(cells: FrozenSet[Cell], size: int) -> List[Tuple]:
+    """Grid edges with a piece cell on exactly one side."""
+    edges = []
+    for (r, c) in cells:
+        for (nr, nc) in ((r + 1, c), (r - 1, c), (r, c + 1), (r, c - 1)):
+            if 0 <= nr < size and 0 <= nc < size and (nr, nc) not in cells:
+                edges.append(("edge",) + tuple(sorted(((r, c), (nr, nc)))))
+    return edges
+
+
+@lru_cache(maxsize=None)
+def _piece_cover_spec(shapes: Tuple[str, ...], size: int, separate: bool) -> Tuple[tuple, tuple, tuple]:
+    """(primary columns, secondary columns, (row id, columns) rows) of the piece matrix."""
+    cells = [(r, c) for r in range(size) for c in range(size)]
+    secondary: List = list(cells)
+    if separate:
+        secondary += [("edge", (r, c), (r + 1, c)) for r in range(size - 1) for c in range(size)]
+        secondary += [("edge", (r, c), (r, c + 1)) for r in range(size) for c in range(size - 1)]
+    rows = []
+    for name in shapes:
+        for p in row_placements(name):
+            placed = frozenset(mask_to_cells(p.mask, size))
+            columns = [name] + sorted(placed)
+            if separate:
+                columns += _edge_columns(placed, size)
+            rows.append(((name, p.mask), tuple(columns)))
+    return tuple(shapes), tuple(secondary), tuple(rows)
+
+
+def piece_cover_dlx(shapes: Tuple[str, ...], size: int = GRID_SIZE, separate: bool = False) -> DLX:
+    """
+    A fresh matrix per search: a DLX's links are mutated while it is being
+    searched, so an instance cannot be shared between concurrent, nested or
+    abandoned searches. Only the (immutable) row and column spec is cached.
+    """
+    primary, secondary, rows = _piece_cover_spec(tuple(shapes), size, separate)
+    dlx = DLX(list(primary), list(secondary))
+    for row_id, columns in rows:
+        dlx.add_row(row_id, columns)
+    return dlx
+
+
+def _piece_checker(hooks, hook_digits, givens, size: int = GRID_SIZE):
+    """
+    accept() callback enforcing hook capacities and the 2x2 rule on partial
+    piece sets. DLX calls it once per pushed row, so the filled mask and the
+    remaining capacities are kept per depth and only the newest row is checked.
+    """
+    hook_masks = [cells_to_mask(cells, size) for cells in hooks]
+    fixed = cells_to_mask(givens, size)
+    capacity = [d - (fixed & m).bit_count() for d, m in zip(hook_digits, hook_masks)]
+    per_cell = window_masks(size)
+    filled_at = [fixed]
+    capacity_at = [capacity]
+
+    def accept(partial) -> bool:
+        depth = len(partial)
+        del filled_at[depth:], capacity_at[depth:]
+        _, last = partial[-1]
+        new_cells = last & ~fixed
+        caps = list(capacity_at[-1])
+        for i, m in enumerate(hook_masks):
+            caps[i] -= (new_cells & m).bit_count()
+            if caps[i] < 0:
+                return False
+        filled = filled_at[-1] | last
+        bits = last
+        while bits:
+            low = bits & -bits
+            for w in per_cell[low.bit_length() - 1]:
+                if filled & w == w:
+                    return False
+            bits ^= low
+        filled_at.append(filled)
+        capacity_at.append(caps)
+        return True
+
+    return accept, min(capacity) >= 0
+
+
+def iter_piece_placements(hooks, hook_digits, shapes, givens=GIVENS, separate: bool = False,
+                          limit: Optional[int] = None) -> Iterator[Dict[str, FrozenSet[Cell]]]:
+    accept, feasible = _piece_checker(hooks, hook_digits, givens)
+    if not feasible:
+        return
+    for rows in piece_cover_dlx(tuple(shapes), separate=separate).iter_solutions(limit, accept):
+        yield {name: frozenset(mask_to_cells(mask, GRID_SIZE)) for name, mask in rows}
+
+
+def count_piece_placements(hooks, hook_digits, shapes, givens=GIVENS, separate: bool = False,
+                           limit: Optional[int] = None) -> int:
+    accept, feasible = _piece_checker(hooks, hook_digits, givens)
+    if not feasible:
+        return 0
+    return piece_cover_dlx(tuple(shapes), separate=separate).count(limit, accept)
+
+
+def iter_placements(givens=GIVENS, shapes=tuple(PENTOMINO_ROW_TARGETS), limit: Optional[int] = None,
+                    separate: bool = False) -> Iterator[HooksPlacement]:
+    """Same enumeration as hooks_engine.iter_placements, on the DLX backend."""
+    one_pos = next((cell for cell, d in givens.items() if d == 1), None)
+    if one_pos is None:
+        return
+    found = 0
+    for hooks in iter_hook_layouts(one_pos):
+        for hook_digits in enumerate_hook_digits(hooks, givens):
+            remaining = None if limit is None else limit - found
+            for pieces in iter_piece_placements(hooks, hook_digits, shapes, givens, separate, remaining):
+                yield HooksPlacement(hooks, hook_digits, pieces)
+                found += 1
+                if limit is not None and found >= limit:
+                    return
+
+
+def count_placements(givens=GIVENS, shapes=tuple(PENTOMINO_ROW_TARGETS), limit: Optional[int] = None,
+                     separate: bool = False) -> int:
+    """Count placements without materializing them (capped at 'limit')."""
+    one_pos = next((cell for cell, d in givens.items() if d == 1), None)
+    if one_pos is None:
+        return 0
+    total = 0
+    for hooks in iter_hook_layouts(one_pos):
+        for hook_digits in enumerate_hook_digits(hooks, givens):
+            remaining = None if limit is None else limit - total
+            total += count_piece_placements(hooks, hook_digits, shapes, givens, separate, remaining)
+            if limit is not None and total >= limit:
+                return total
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hooks 11 placement search on the Dancing Links backend.")
+    parser.add_argument("--limit", type=int, default=None, help="stop after this many placements")
+    parser.add_argument("--separate", action="store_true", help="forbid pentominoes from touching orthogonally")
+    parser.add_argument("--layouts", action="store_true", help="only count hook layouts")
+    args = parser.parse_args()
+
+    if args.layouts:
+        one_pos = next(cell for cell, d in GIVENS.items() if d == 1)
+        print(hook_tiling_dlx(one_pos).count(args.limit))
+        return
+    print(count_placements(limit=args.limit, separate=args.separate))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,18 @@
+import argparse
+import heapq
 import itertools
+import math
 from collections import deque
+from functools import lru_cache, partial
 from multiprocessing import Pool, cpu_count
 import sys
 import time
 
+from solve_cache import add_cache_arguments, cached_solve, report_hit
+
+# Bump when a change could alter results, so cached solutions are not reused
+SOLVER_VERSION = 3
+
 # Define the grid with labels
 grid_labels = [
     ['A', 'B', 'B', 'C', 'C', 'C'],  # y=5 (a6 to f6)
@@ -18,7 +27,8 @@ grid_labels = [
 knight_moves = [(-2, -1), (-1, -2), (1, -2), (2, -1),
                (2, 1), (1, 2), (-1, 2), (-2, 1)]
 
-# Precompute all possible knight moves for each cell
+# Precompute all possible knight moves for each cell, on first use (pool workers get build_tables instead)
+@lru_cache(maxsize=None)
 def precompute_knight_moves():
     moves = {}
     for y in range(6):
@@ -31,8 +41,6 @@ def precompute_knight_moves():
             moves[(x, y)] = current_moves
     return moves
 
-knight_moves_dict = precompute_knight_moves()
-
 # Function to convert coordinates to cell name
 def coord_to_cell(x, y):
     return chr(ord('a') + x) + str(y + 1)
@@ -60,6 +68,57 @@ def assign_values(A, B, C):
     #     print(row)
     return values
 
+# Flat tables shared with pool workers: cell index i = y * 6 + x
+CELL_COUNT = 36
+NO_MOVE = 255
+LABEL_CODES = {'A': 0, 'B': 1, 'C': 2}
+
+# Function to build the uint8 tables: the label code of every cell, then 8 knight-move targets per cell
+def build_tables():
+    table = bytearray(CELL_COUNT * 9)
+    for y in range(6):
+        for x in range(6):
+            i = y * 6 + x
+            table[i] = LABEL_CODES[get_label(x, y)]
+            targets = [ny * 6 + nx for nx, ny in precompute_knight_moves()[(x, y)]]
+            targets += [NO_MOVE] * (8 - len(targets))
+            table[CELL_COUNT + 8 * i:CELL_COUNT + 8 * (i + 1)] = bytes(targets)
+    return bytes(table)
+
+# Tables handed to this process by init_worker: (labels, neighbours)
+worker_tables = None
+
+# Pool initializer: keep the parent's tables (built once, passed as initargs) for every task
+def init_worker(tables):
+    global worker_tables
+    worker_tables = (tables[:CELL_COUNT], tables[CELL_COUNT:CELL_COUNT * 9])
+
+# Function to expand the tables for one (A, B, C): the values grid and find_path_dp's move lists
+def values_and_moves(assignment, labels, neighbours):
+    cell_values = [assignment[code] for code in labels]
+    values = [cell_values[y * 6:(y + 1) * 6] for y in range(6)]
+    moves = [
+        [(j, cell_values[j], labels[j] != labels[i]) for j in neighbours[8 * i:8 * (i + 1)] if j != NO_MOVE]
+        for i in range(CELL_COUNT)
+    ]
+    return values, moves
+
+# Function to build, from a values grid, the per-cell-index move lists of (target index, value, multiply)
+# tuples that find_path_dp and find_path_best_first walk; multiply marks a label change
+def trip_moves(values):
+    return [
+        [(ny * 6 + nx, values[ny][nx], get_label(nx, ny) != get_label(x, y))
+         for nx, ny in precompute_knight_moves()[(x, y)]]
+        for y in range(6) for x in range(6)
+    ]
+
+# Functions to encode a path as one byte per cell index, and back
+def encode_path(path):
+    return bytes(y * 6 + x for x, y in path)
+
+def decode_path(data):
+    return [(i % 6, i // 6) for i in data]
+
 # Function to calculate the score of a given path
 def calculate_score(path, values):
     if not path:
@@ -88,30 +147,30 @@ def calculate_score(path, values):
     return score
 
 # Function to find a path using BFS that exactly reaches the target score
-def find_path_bfs(start, end, values, target_score):
+# 'moves' (per cell index: (target, value, multiply) tuples) can be passed in precomputed, as for find_path_dp
+def find_path_bfs(start, end, values, target_score, moves=None):
+    cells = [(x, y) for y in range(6) for x in range(6)]
+    if moves is None:
+        moves = trip_moves(values)
+    start_i, end_i = start[1] * 6 + start[0], end[1] * 6 + end[0]
     queue = deque()
     initial_score = values[start[1]][start[0]]
     queue.append((
-        [start],  # path
+        [start_i],  # path, as cell indices
         initial_score  # current score
     ))
     
     while queue:
         path, score = queue.popleft()
         current = path[-1]
-        if current == end:
+        if current == end_i:
             if score == target_score:
-                # Debug: Found a valid path
-                # print(f"Valid path found: {[coord_to_cell(x, y) for (x, y) in path]}")
-                return path
+                return [cells[i] for i in path]
             continue
-        for move in knight_moves_dict[current]:
+        for move, value_next, multiply in moves[current]:
             if move in path:
                 continue  # Cannot revisit within the same trip
-            label_current = get_label(current[0], current[1])
-            label_next = get_label(move[0], move[1])
-            value_next = values[move[1]][move[0]]
-            if label_next != label_current:
+            if multiply:
                 new_score = score * value_next
             else:
                 new_score = score + value_next
@@ -127,14 +186,200 @@ def find_path_bfs(start, end, values, target_score):
             ))
     return None  # No path found
 
+# Function to apply one move to a set of scores stored as a big-int bitset (bit s set = score s reachable)
+def step_scores(bits, value, multiply, limit_mask, target_score):
+    if not multiply:
+        return (bits << value) & limit_mask  # adding shifts every score at once
+    # Multiplying is a sparse remap of the set bits, lowest first, stopping once past the target
+    result = 0
+    while bits:
+        low = bits & -bits
+        product = (low.bit_length() - 1) * value
+        if product > target_score:
+            break
+        result |= 1 << product
+        bits ^= low
+    return result
+
+# Outcomes of the bounded searches: the dp mode stops at its length cap, the anytime one at its budget
+FOUND, EXHAUSTED, CAPPED, TIMEOUT = "found", "exhausted", "capped", "timeout"
+
+# Default trip length cap of the (experimental) dp mode. Visited-set states barely merge with small
+# A, B, C (about 1.2M states at 13 cells), so the cap is what bounds it: with 10 the full search ends
+# in ~12s, but most assignments still have open trips there and come back CAPPED.
+DP_MAX_LENGTH = 10
+
+# Function to find a path with a dynamic program over (cell, visited mask) states.
+# Like find_path_bfs it looks for a shortest path hitting the target score, but all paths
+# reaching the same cell with the same visited set are merged into one state holding the bitset of
+# their scores <= target. Layers (one per path length) are kept as back-pointers for reconstruction.
+# Returns (FOUND, path), (EXHAUSTED, None) when no trip of any length exists, or (CAPPED, None) when
+# trips were still open at 'max_length' cells, so longer ones were not tried.
+# 'moves' (per cell index: (target, value, multiply) tuples) can be passed in precomputed.
+def find_path_dp(start, end, values, target_score, max_length=DP_MAX_LENGTH, moves=None):
+    cells = [(x, y) for y in range(6) for x in range(6)]
+    index = {cell: i for i, cell in enumerate(cells)}
+    if moves is None:
+        moves = trip_moves(values)
+    limit_mask = (1 << (target_score + 1)) - 1
+    start_i, end_i = index[start], index[end]
+    initial_score = values[start[1]][start[0]]
+    if initial_score > target_score:
+        return (EXHAUSTED, None)
+
+    def reached(layer):
+        return next(((cell, visited) for (cell, visited), bits in layer.items()
+                     if cell == end_i and bits >> target_score & 1), None)
+
+    layers = [{(start_i, 1 << start_i): 1 << initial_score}]
+    final = reached(layers[-1])
+    while final is None and layers[-1] and len(layers) < max_length:
+        frontier = {}
+        for (current, visited), bits in layers[-1].items():
+            if current == end_i:
+                continue  # a trip ends on reaching its end cell
+            for move, value, multiply in moves[current]:
+                bit = 1 << move
+                if visited & bit:
+                    continue  # Cannot revisit within the same trip
+                new_bits = step_scores(bits, value, multiply, limit_mask, target_score)
+                if new_bits:
+                    key = (move, visited | bit)
+                    frontier[key] = frontier.get(key, 0) | new_bits
+        layers.append(frontier)
+        final = reached(frontier)
+    if final is None:
+        if any(cell != end_i for cell, _ in layers[-1]):
+            return (CAPPED, None)
+        return (EXHAUSTED, None)
+
+    # Walk back: a predecessor state must hold a score that the move turns into the needed one
+    path = [final[0]]
+    (current, visited), needed = final, target_score
+    for layer in reversed(layers[:-1]):
+        visited &= ~(1 << current)
+        for prev, _, _ in moves[current]:  # knight moves are symmetric
+            bits = layer.get((prev, visited), 0)
+            if not bits:
+                continue
+            _, value, multiply = next(m for m in moves[prev] if m[0] == current)
+            if multiply:
+                score = needed // value if needed % value == 0 else -1
+            else:
+                score = needed - value
+            if score >= 0 and bits >> score & 1:
+                path.append(prev)
+                current, needed = prev, score
+                break
+    return (FOUND, [cells[i] for i in reversed(path)])
+
+# Time and node allowance shared by the searches of one task; the clock is read every 256 nodes
+class SearchBudget:
+    def __init__(self, seconds=None, nodes=None):
+        self.deadline = None if seconds is None else time.monotonic() + seconds
+        self.nodes_left = nodes
+        self.spent = 0
+
+    def spend(self):
+        self.spent += 1
+        if self.nodes_left is not None and self.spent > self.nodes_left:
+            return False
+        if self.deadline is not None and self.spent % 256 == 0 and time.monotonic() > self.deadline:
+            return False
+        return True
+
+# Function to compute knight-move distances from every cell index to 'end' (index)
+def knight_distances(end, moves):
+    dist = [None] * CELL_COUNT
+    dist[end] = 0
+    queue = deque([end])
+    while queue:
+        cell = queue.popleft()
+        for move, _, _ in moves[cell]:
+            if dist[move] is None:
+                dist[move] = dist[cell] + 1
+                queue.append(move)
+    return dist
+
+# Function for an anytime best-first search: returns (FOUND, path), (EXHAUSTED, None) when no path
+# exists, or (TIMEOUT, None) when 'budget' ran out first, so the caller can retry with a bigger one.
+# States (cell, visited, score) are ordered by the knight distance to the end cell plus an estimate
+# of the moves still needed to grow the score to the target; equal states are expanded once.
+def find_path_best_first(start, end, values, target_score, budget=None, moves=None):
+    cells = [(x, y) for y in range(6) for x in range(6)]
+    index = {cell: i for i, cell in enumerate(cells)}
+    if moves is None:
+        moves = trip_moves(values)
+    budget = budget or SearchBudget()
+    start_i, end_i = index[start], index[end]
+    dist = knight_distances(end_i, moves)
+    growth = math.log(max(max(row) for row in values) + 1)
+
+    def priority(cell, score):
+        return dist[cell] + math.log(target_score / score) / growth
+
+    initial_score = values[start[1]][start[0]]
+    if initial_score > target_score:
+        return (EXHAUSTED, None)
+    counter = itertools.count()
+    # Entries: (priority, -order, cell, visited, score, path as a (cell, parent) chain); newest first on ties
+    heap = [(priority(start_i, initial_score), 0, start_i, 1 << start_i, initial_score, (start_i, None))]
+    seen = set()
+    while heap:
+        _, _, current, visited, score, chain = heapq.heappop(heap)
+        if current == end_i:
+            if score == target_score:
+                path = []
+                while chain is not None:
+                    path.append(cells[chain[0]])
+                    chain = chain[1]
+                return (FOUND, path[::-1])
+            continue  # a trip ends on reaching its end cell
+        if not budget.spend():
+            return (TIMEOUT, None)
+        for move, value, multiply in moves[current]:
+            bit = 1 << move
+            if visited & bit:
+                continue  # Cannot revisit within the same trip
+            new_score = score * value if multiply else score + value
+            if new_score > target_score:
+                continue  # Scores never decrease, so this branch is dead
+            state = (move, visited | bit, new_score)
+            if state in seen:
+                continue
+            seen.add(state)
+            heapq.heappush(heap, (priority(move, new_score), -next(counter), move, visited | bit, new_score,
+                                  (move, chain)))
+    return (EXHAUSTED, None)
+
 # Function to format the path
 def format_path(path):
     return ",".join([coord_to_cell(x, y) for (x, y) in path])
 
 # Function to process a single (A, B, C) assignment
-def process_assignment(assignment):
+# Success is None when the dp mode hit its length cap or the anytime mode ran out of budget
+# (unknown: worth retrying with a longer cap or a bigger budget)
+def process_assignment(assignment, mode="bfs", max_length=DP_MAX_LENGTH, time_budget=None, node_budget=None):
     A, B, C = assignment
-    values = assign_values(A, B, C)
+    if worker_tables is not None:
+        values, moves = values_and_moves(assignment, *worker_tables)
+    else:
+        values, moves = assign_values(A, B, C), None
+    outcomes = []
+    if mode == "dp":
+        def find_path(start, end, values, target_score):
+            status, path = find_path_dp(start, end, values, target_score, max_length, moves)
+            outcomes.append(status)
+            return path
+    elif mode == "anytime":
+        budget = SearchBudget(time_budget, node_budget)  # shared by both trips
+
+        def find_path(start, end, values, target_score):
+            status, path = find_path_best_first(start, end, values, target_score, budget, moves)
+            outcomes.append(status)
+            return path
+    else:
+        find_path = partial(find_path_bfs, moves=moves)
     # Define start and end points for both trips
     trip1_start = (0, 0)  # a1
     trip1_end = (5, 5)    # f6
@@ -142,8 +387,10 @@ def process_assignment(assignment):
     trip2_end = (5, 0)    # f1
 
     # Find path for Trip 1
-    path1 = find_path_bfs(trip1_start, trip1_end, values, 2024)
+    path1 = find_path(trip1_start, trip1_end, values, 2024)
     if not path1:
+        if outcomes and outcomes[-1] in (CAPPED, TIMEOUT):
+            return (A, B, C, None, None)
         return (A, B, C, False, None)  # No valid path for Trip 1
 
     # Verify Trip 1 score
@@ -152,8 +399,10 @@ def process_assignment(assignment):
         return (A, B, C, False, None)  # Trip 1 does not meet the target score
 
     # Find path for Trip 2
-    path2 = find_path_bfs(trip2_start, trip2_end, values, 2024)
+    path2 = find_path(trip2_start, trip2_end, values, 2024)
     if not path2:
+        if outcomes and outcomes[-1] in (CAPPED, TIMEOUT):
+            return (A, B, C, None, None)
         return (A, B, C, False, None)  # No valid path for Trip 2
 
     # Verify Trip 2 score
@@ -178,43 +427,108 @@ def generate_assignments():
                 yield (A, B, C)
 
 # Worker function defined at the top level for multiprocessing
-def worker(assignment):
-    return process_assignment(assignment)
+# Paths come back as byte strings of cell indices to keep the pickled results small
+def worker(assignment, mode="bfs", max_length=DP_MAX_LENGTH, time_budget=None, node_budget=None):
+    A, B, C, success, solution = process_assignment(assignment, mode, max_length, time_budget, node_budget)
+    if solution is not None:
+        solution = tuple(encode_path(path) for path in solution)
+    return (A, B, C, success, solution)
 
 # Main function with progress tracking and detailed attempt logging
 def main():
-    print("Starting the search for a valid solution...")
-    assignments = list(generate_assignments())
-    total = len(assignments)
-    print(f"Total assignments to process: {total}")
-    processed = 0
-    last_print_time = time.time()
-    print_interval = 5  # seconds
-
-    pool_size = max(cpu_count() - 1, 1)  # Leave one core free
-    with Pool(pool_size) as pool:
-        # Using imap_unordered to get results as they are completed
-        for result in pool.imap_unordered(worker, assignments, chunksize=100):
-            processed += 1
-            A, B, C, success, solution = result
-            # Print every attempt
-            print(f"Attempting A={A}, B={B}, C={C}, Success: {success}")
-            if success:
-                path1, path2 = solution
-                trip1_formatted = format_path(path1)
-                trip2_formatted = format_path(path2)
-                output = f"{A},{B},{C},{trip1_formatted},{trip2_formatted}"
-                print("\nFinal Solution:")
-                print(output)
-                pool.terminate()  # Stop further processing
-                return
-            # Periodic progress updates
-            current_time = time.time()
-            if current_time - last_print_time >= print_interval:
-                percent = (processed / total) * 100
-                print(f"Processed {processed}/{total} assignments ({percent:.2f}%)")
-                last_print_time = current_time
-    print("No solution found with A + B + C < 50.")
+    parser = argparse.ArgumentParser(description="Search A, B, C and two knight trips scoring 2024.")
+    parser.add_argument("--mode", choices=("bfs", "dp", "anytime"), default="bfs",
+                        help="bfs keeps every path (complete); dp (experimental) merges paths by (cell, "
+                             "visited set) with score bitsets but stops at --max-length cells and reports "
+                             "the assignments it could not settle; anytime is a budgeted best-first search")
+    parser.add_argument("--max-length", type=int, default=DP_MAX_LENGTH,
+                        help="longest trip (in cells) the dp mode considers; its state count grows "
+                             "exponentially with this, so raise it with care")
+    parser.add_argument("--time-budget", type=float, default=2.0,
+                        help="seconds per assignment in the first anytime round")
+    parser.add_argument("--node-budget", type=int, default=None,
+                        help="expanded states per assignment in the first anytime round")
+    parser.add_argument("--rounds", type=int, default=3,
+                        help="anytime rounds; each re-queues the timed-out assignments with 4x the budgets")
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+    rounds = args.rounds if args.mode == "anytime" else 1
+
+    # Runs the pool over every assignment; returns ((status, detail), assignments tried), where the
+    # status is FOUND with the answer line, EXHAUSTED, or TIMEOUT with how many are still unknown
+    def search():
+        print("Starting the search for a valid solution...")
+        pending = list(generate_assignments())
+        order = {assignment: i for i, assignment in enumerate(pending)}
+        print(f"Total assignments to process: {len(pending)}")
+        processed = 0
+        last_print_time = time.time()
+        print_interval = 5  # seconds
+        time_budget, node_budget = args.time_budget, args.node_budget
+
+        pool_size = max(cpu_count() - 1, 1)  # Leave one core free
+        chunksize = 4 if args.mode == "anytime" else 100  # small chunks keep budgeted latency low
+        # Tables are built once here and handed to every worker as it starts
+        with Pool(pool_size, initializer=init_worker, initargs=(build_tables(),)) as pool:
+            for round_number in range(1, rounds + 1):
+                total = len(pending)
+                unknown = []
+                task = partial(worker, mode=args.mode, max_length=args.max_length,
+                               time_budget=time_budget, node_budget=node_budget)
+                # Using imap_unordered to get results as they are completed
+                for done, result in enumerate(pool.imap_unordered(task, pending, chunksize=chunksize), 1):
+                    processed += 1
+                    A, B, C, success, solution = result
+                    # Print every attempt
+                    print(f"Attempting A={A}, B={B}, C={C}, Success: {success}")
+                    if success:
+                        path1, path2 = (decode_path(path) for path in solution)
+                        trip1_formatted = format_path(path1)
+                        trip2_formatted = format_path(path2)
+                        pool.terminate()  # Stop further processing
+                        return (FOUND, f"{A},{B},{C},{trip1_formatted},{trip2_formatted}"), processed
+                    if success is None:
+                        unknown.append((A, B, C))
+                    # Periodic progress updates
+                    current_time = time.time()
+                    if current_time - last_print_time >= print_interval:
+                        percent = (done / total) * 100
+                        print(f"Processed {done}/{total} assignments in round {round_number} ({percent:.2f}%)")
+                        last_print_time = current_time
+                if not unknown:
+                    break
+                if round_number == rounds:
+                    return (TIMEOUT, len(unknown)), processed
+                # Re-queue what ran out of budget, in the original order, with a bigger budget
+                pending = sorted(unknown, key=order.get)
+                time_budget = None if time_budget is None else time_budget * 4
+                node_budget = None if node_budget is None else node_budget * 4
+                print(f"Round {round_number}: {len(pending)} assignments timed out, re-queued with 4x budget")
+        return (EXHAUSTED, None), processed
+
+    params = {"mode": args.mode, "max_length": args.max_length, "target": 2024, "max_sum": 50}
+    if args.mode == "anytime":
+        params.update(time_budget=args.time_budget, node_budget=args.node_budget, rounds=args.rounds)
+    # An unsettled run (dp stopped at its cap, anytime out of budget) is not worth keeping
+    (status, detail), hit = cached_solve(
+        "knight_trip", SOLVER_VERSION, params, search, args.cache,
+        keep=lambda output: output[0] != TIMEOUT,
+    )
+    report_hit(hit)
+    if status == TIMEOUT:
+        if args.mode == "dp":
+            print(f"Warning: the dp mode stopped at --max-length {args.max_length} with trips still open for "
+                  f"{detail} assignments, and none of the others has a solution. Longer trips were not "
+                  f"tried; raise --max-length or use --mode bfs.", file=sys.stderr)
+        else:
+            print(f"Unknown: {detail} assignments still timed out after {args.rounds} rounds and none of the "
+                  f"others has a solution. Retry with a bigger --time-budget or more --rounds.")
+        return
+    if status == EXHAUSTED:
+        print("No solution found with A + B + C < 50.")
+        return
+    print("\nFinal Solution:")
+    print(detail)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
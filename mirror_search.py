@@ -0,0 +1,155 @@
+"""
+Exact arrangement search for Hall of Mirrors clue sets, for uniqueness checks.
+
+hall_of_mirrors_solver places mirrors along one clued laser at a time and
+then re-traces the earlier lasers to see whether they still hit their
+targets. This search instead decides every cell a clued laser crosses as
+the laser reaches it (empty, '/' or '\\') on a flat cell array with undo.
+A traced laser therefore can never be disturbed later and needs no
+re-check, every arrangement is reached by exactly one branch, and the
+laser that enters where a traced one leaves (same path, reversed) is
+settled without tracing. A partial product above the target ends a branch
+at once, since every later segment only multiplies it further.
+
+The model is the solver's: mirrors only on the clued lasers' paths, never
+two orthogonally adjacent, and cells that no clued laser crosses stay empty.
+"""
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import argparse
+import time
+
+from hall_of_mirrors_solver import CHALLENGES, SearchBudgetExceeded
+
+SIZE = 10
+# Cell states; the mirror codes match mirror_tracer's
+EMPTY, SLASH, BACKSLASH, UNKNOWN = 0, 1, 2, 3
+KINDS = {SLASH: "/", BACKSLASH: "\\"}
+
+
+def _bounce(kind: int, dx: int, dy: int) -> Tuple[int, int]:
+    # '/' swaps (dx, dy) -> (dy, dx); '\' maps (dx, dy) -> (-dy, -dx)
+    return (dy, dx) if kind == SLASH else (-dy, -dx)
+
+
+class ArrangementSearch:
+    """
+    Depth-first search over the clues of one instance. Lasers are traced in
+    increasing target order (small targets have few factorizations), and
+    iter_arrangements() yields each arrangement as a solver-style dict
+    {(x, y): (kind, None)}. 'max_nodes' bounds the cells visited and raises
+    SearchBudgetExceeded past it.
+    """
+
+    def __init__(self, challenges: Sequence[dict], size: int = SIZE, max_nodes: Optional[int] = None):
+        self.size = size
+        self.max_nodes = max_nodes
+        self.nodes = 0
+        # (start ix, iy, dx, dy, target): the start is the edge cell just outside the grid
+        self.lasers: List[Tuple[int, int, int, int, int]] = sorted(
+            ((round(c["origin"][0] - 0.5), round(c["origin"][1] - 0.5), c["vector"][0], c["vector"][1],
+              c["target"]) for c in challenges),
+            key=lambda laser: laser[4],
+        )
+        self.clue_at: Dict[Tuple[int, int, int, int], int] = {laser[:4]: i for i, laser in enumerate(self.lasers)}
+        self.done = [False] * len(self.lasers)
+        self.cells = [UNKNOWN] * (size * size)
+
+    def iter_arrangements(self) -> Iterator[Dict]:
+        for _ in self._next_clue():
+            yield {
+                (i // self.size + 0.5, i % self.size + 0.5): (KINDS[state], None)
+                for i, state in enumerate(self.cells) if state in KINDS
+            }
+
+    def count(self, limit: Optional[int] = None) -> int:
+        found = 0
+        for _ in self._next_clue():
+            found += 1
+            if limit is not None and found >= limit:
+                break
+        return found
+
+    def _next_clue(self) -> Iterator[None]:
+        for i, laser in enumerate(self.lasers):
+            if not self.done[i]:
+                self.done[i] = True
+                ix, iy, dx, dy, target = laser
+                yield from self._walk(target, ix, iy, dx, dy, 1, 0)
+                self.done[i] = False
+                return
+        yield None
+
+    def _can_place(self, ix: int, iy: int) -> bool:
+        size, cells = self.size, self.cells
+        for nx, ny in ((ix + 1, iy), (ix - 1, iy), (ix, iy + 1), (ix, iy - 1)):
+            if 0 <= nx < size and 0 <= ny < size and cells[nx * size + ny] in KINDS:
+                return False
+        return True
+
+    def _walk(self, target: int, ix: int, iy: int, dx: int, dy: int, mult: int, segment: int) -> Iterator[None]:
+        """Continue a laser at (ix, iy) heading (dx, dy); 'mult' covers the finished segments."""
+        size, cells = self.size, self.cells
+        while True:
+            self.nodes += 1
+            if self.max_nodes is not None and self.nodes > self.max_nodes:
+                raise SearchBudgetExceeded()
+            ix += dx
+            iy += dy
+            segment += 1
+            if mult * segment > target:
+                return  # later segments only multiply the product further
+            if not (0 <= ix < size and 0 <= iy < size):
+                if mult * segment != target:
+                    return
+                # The laser entering here retraces this path backwards
+                reverse = self.clue_at.get((ix, iy, -dx, -dy))
+                if reverse is None:
+                    yield from self._next_clue()
+                elif self.lasers[reverse][4] == target and not self.done[reverse]:
+                    self.done[reverse] = True
+                    yield from self._next_clue()
+                    self.done[reverse] = False
+                return
+            cell = ix * size + iy
+            state = cells[cell]
+            if state == EMPTY:
+                continue
+            if state != UNKNOWN:
+                mult *= segment
+                if target % mult:
+                    return
+                segment = 0
+                dx, dy = _bounce(state, dx, dy)
+                continue
+            # An undecided cell: a mirror of either kind here, or empty
+            bounced = mult * segment
+            if target % bounced == 0 and self._can_place(ix, iy):
+                for kind in (SLASH, BACKSLASH):
+                    cells[cell] = kind
+                    ndx, ndy = _bounce(kind, dx, dy)
+                    yield from self._walk(target, ix, iy, ndx, ndy, bounced, 0)
+            cells[cell] = EMPTY
+            yield from self._walk(target, ix, iy, dx, dy, mult, segment)
+            cells[cell] = UNKNOWN
+            return
+
+
+def count_arrangements(challenges: Sequence[dict], limit: Optional[int] = None,
+                       max_nodes: Optional[int] = None) -> int:
+    """Arrangements meeting every clue (capped at 'limit'); SearchBudgetExceeded past 'max_nodes'."""
+    return ArrangementSearch(challenges, max_nodes=max_nodes).count(limit)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count the arrangements meeting the Hall of Mirrors clues.")
+    parser.add_argument("--limit", type=int, default=None, help="stop counting at this many")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    search = ArrangementSearch(CHALLENGES)
+    found = search.count(args.limit)
+    print(f"{found} arrangements, {search.nodes} cells visited in {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
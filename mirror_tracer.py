@@ -0,0 +1,167 @@
+"""
+Vectorized laser tracer for Hall of Mirrors layouts.
+
+Traces all 40 edge lasers of one or many 10x10 layouts in lockstep with
+NumPy: every ray is a (position, direction, segment length, product) row,
+and each iteration advances all active rays by one cell, multiplying the
+finished segment into the product wherever a ray hits a mirror or leaves
+the board. Produces the same numbers as
+hall_of_mirrors_solver.evaluate_laser_path_product, without the per-step
+Python loop.
+
+Coordinates follow the solver: cell centers at x, y = 0.5 .. 9.5, lasers
+start on the edges at -0.5 / 10.5. Internally a cell is (ix, iy) = (x - 0.5,
+y - 0.5) and grids are indexed grid[..., ix, iy] with codes EMPTY, SLASH ('/')
+and BACKSLASH ('\\').
+"""
+from typing import Dict, List, Sequence, Tuple
+import argparse
+import time
+
+import numpy as np
+
+from hall_of_mirrors_solver import CHALLENGES, complete_all_challenges
+
+SIZE = 10
+EMPTY, SLASH, BACKSLASH = 0, 1, 2
+MIRROR_CODES = {"/": SLASH, "\\": BACKSLASH}
+
+
+def edge_lasers(size: int = SIZE) -> List[Tuple[Tuple[float, float], Tuple[int, int]]]:
+    """The 4 * size edge lasers as (origin, vector) in solver coordinates: bottom, top, left, right."""
+    lasers = []
+    for i in range(size):
+        lasers.append(((i + 0.5, -0.5), (0, 1)))
+    for i in range(size):
+        lasers.append(((i + 0.5, size + 0.5), (0, -1)))
+    for i in range(size):
+        lasers.append(((-0.5, i + 0.5), (1, 0)))
+    for i in range(size):
+        lasers.append(((size + 0.5, i + 0.5), (-1, 0)))
+    return lasers
+
+
+LASER_INDEX: Dict[Tuple[Tuple[float, float], Tuple[int, int]], int] = {
+    laser: i for i, laser in enumerate(edge_lasers())
+}
+
+
+def arrangement_to_grid(arrangement, size: int = SIZE) -> np.ndarray:
+    """Solver arrangement {(x, y): (kind, _)} -> int8 grid of mirror codes."""
+    grid = np.zeros((size, size), dtype=np.int8)
+    for (x, y), (kind, _) in arrangement.items():
+        grid[int(x - 0.5), int(y - 0.5)] = MIRROR_CODES[kind]
+    return grid
+
+
+def trace_all(grids: np.ndarray, return_paths: bool = False):
+    """
+    Products of every edge laser for a batch of layouts.
+
+    grids: (B, size, size) or (size, size) mirror codes.
+    Returns int64 products of shape (B, 4 * size) (or (4 * size,)), in
+    edge_lasers() order. A product that would overflow int64 is returned as -1.
+    With return_paths=True, also returns a boolean (B, 4 * size, size, size)
+    array (leading axis dropped likewise) marking every cell each laser
+    crosses, the mirrors it bounces off included.
+    """
+    single = grids.ndim == 2
+    grids = np.asarray(grids, dtype=np.int8).reshape((-1,) + grids.shape[-2:])
+    batch, size, _ = grids.shape
+    lasers = edge_lasers(size)
+    n = batch * len(lasers)
+
+    # One row per (layout, laser)
+    board = np.repeat(np.arange(batch), len(lasers))
+    ix = np.tile(np.array([x - 0.5 for (x, _), _ in lasers], dtype=np.int64), batch)
+    iy = np.tile(np.array([y - 0.5 for (_, y), _ in lasers], dtype=np.int64), batch)
+    dx = np.tile(np.array([v[0] for _, v in lasers], dtype=np.int64), batch)
+    dy = np.tile(np.array([v[1] for _, v in lasers], dtype=np.int64), batch)
+    segment = np.zeros(n, dtype=np.int64)
+    product = np.ones(n, dtype=np.int64)
+    approx = np.ones(n, dtype=np.float64)  # float shadow of the product, to detect int64 overflow
+    active = np.arange(n)
+    paths = np.zeros((n, size, size), dtype=bool) if return_paths else None
+
+    # A ray from the edge can never loop, so this ends; each cell is crossed at most twice per ray
+    while active.size:
+        ix[active] += dx[active]
+        iy[active] += dy[active]
+        segment[active] += 1
+        x, y = ix[active], iy[active]
+        outside = (x < 0) | (x >= size) | (y < 0) | (y >= size)
+        code = np.zeros(active.size, dtype=np.int8)
+        inside = ~outside
+        code[inside] = grids[board[active[inside]], x[inside], y[inside]]
+        if return_paths:
+            crossing = active[inside]
+            paths[crossing, ix[crossing], iy[crossing]] = True
+
+        hit = active[code != EMPTY]
+        done = active[outside]
+        ends = np.concatenate((hit, done))
+        product[ends] *= segment[ends]
+        approx[ends] *= segment[ends]
+        segment[ends] = 0
+
+        # '/' swaps (dx, dy) -> (dy, dx); '\' maps (dx, dy) -> (-dy, -dx)
+        slash = active[code == SLASH]
+        dx[slash], dy[slash] = dy[slash], dx[slash]
+        back = active[code == BACKSLASH]
+        dx[back], dy[back] = -dy[back], -dx[back]
+
+        active = active[inside]
+
+    product[approx >= 2.0 ** 63] = -1
+    product = product.reshape(batch, len(lasers))
+    if not return_paths:
+        return product[0] if single else product
+    paths = paths.reshape(batch, len(lasers), size, size)
+    return (product[0], paths[0]) if single else (product, paths)
+
+
+def challenge_indices(challenges: Sequence[dict]) -> np.ndarray:
+    return np.array([LASER_INDEX[(tuple(c["origin"]), tuple(c["vector"]))] for c in challenges])
+
+
+def verify_layouts(grids: np.ndarray, challenges: Sequence[dict] = CHALLENGES) -> np.ndarray:
+    """Boolean per layout: every clued laser hits its target."""
+    products = trace_all(np.asarray(grids).reshape((-1, SIZE, SIZE)))
+    targets = np.array([c["target"] for c in challenges])
+    return (products[:, challenge_indices(challenges)] == targets).all(axis=1)
+
+
+def unlabeled_products(grid: np.ndarray, challenges: Sequence[dict] = CHALLENGES) -> Dict[Tuple, int]:
+    """{(origin, vector): product} for every edge laser without a clue."""
+    products = trace_all(grid)
+    clued = set(challenge_indices(challenges).tolist())
+    return {laser: int(products[i]) for i, laser in enumerate(edge_lasers()) if i not in clued}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trace every edge laser of the solved Hall of Mirrors layout.")
+    parser.add_argument("--bench", type=int, default=0, help="also time tracing this many copies of the layout")
+    args = parser.parse_args()
+
+    challenges = sorted((dict(c) for c in CHALLENGES), key=lambda c: c["target"])
+    layout = complete_all_challenges(challenges, {}, 0)
+    if layout is None:
+        print("No solution")
+        return
+    grid = arrangement_to_grid(layout)
+    assert verify_layouts(grid)[0]
+
+    missing = unlabeled_products(grid)
+    for (origin, vector), product in missing.items():
+        print(f"{origin} {vector}: {product}")
+    print(f"Sum of unlabeled products: {sum(missing.values())}")
+
+    if args.bench:
+        grids = np.repeat(grid[None], args.bench, axis=0)
+        start = time.perf_counter()
+        ok = verify_layouts(grids)
+        print(f"Verified {ok.sum()}/{len(ok)} layouts in {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
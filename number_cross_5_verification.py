@@ -1,6 +1,16 @@
+import argparse
+import json
+import os
 import sys
 from collections import Counter
+from itertools import islice
 from math import prod
+from multiprocessing import Pool, cpu_count
+
+from solve_cache import add_cache_arguments, cached_solve, file_key, report_hit
+
+# Bump when a change could alter results, so cached verdicts are not reused
+SOLVER_VERSION = 1
 
 
 def parse_nums(line: str) -> list[int]:
@@ -52,11 +62,42 @@ def is_fibonacci(n: int) -> bool:
     return b == n
 
 
-def is_prime_from_file(n: int, path: str = "../resources/primes.txt") -> bool:
+# Sorted list of primes, one per line, looked up by is_prime_from_file
+PRIMES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "primes.txt")
+
+
+def is_probable_prime(n: int) -> bool:
+    """Deterministic Miller-Rabin (exact for n < 3.3e24)."""
+    if n < 2:
+        return False
+    bases = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+    for p in bases:
+        if n % p == 0:
+            return n == p
+    d, r = n - 1, 0
+    while d % 2 == 0:
+        d, r = d // 2, r + 1
+    for a in bases:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(r - 1):
+            x = pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def is_prime_from_file(n: int, path: str = PRIMES_PATH) -> bool:
     """
     Checks primality by looking up n in a sorted list of primes (one per line).
-    Stops early once primes exceed the length of n.
+    Stops early once primes exceed the length of n. Without the list file,
+    falls back to is_probable_prime.
     """
+    if not os.path.exists(path):
+        return is_probable_prime(n)
     s = str(n)
     with open(path) as f:
         for line in f:
@@ -68,36 +109,127 @@ def is_prime_from_file(n: int, path: str = "../resources/primes.txt") -> bool:
     return False
 
 
-def main():
-    # One check per row, in the order given by the puzzle hints
-    checks = [
-        is_square,
-        product_of_digits_equals(20),
-        is_multiple_of(13),
-        is_multiple_of(32),
-        divisible_by_each_digit,
-        product_of_digits_equals(25),
-        divisible_by_each_digit,
-        is_odd_palindrome,
-        is_fibonacci,
-        product_of_digits_equals(2025),
-        is_prime_from_file,
-    ]
-
-    # Read all lines from stdin, parse into integer lists
-    rows = [parse_nums(line) for line in sys.stdin.read().splitlines()]
+# One check per row, in the order given by the puzzle hints
+CHECKS = [
+    is_square,
+    product_of_digits_equals(20),
+    is_multiple_of(13),
+    is_multiple_of(32),
+    divisible_by_each_digit,
+    product_of_digits_equals(25),
+    divisible_by_each_digit,
+    is_odd_palindrome,
+    is_fibonacci,
+    product_of_digits_equals(2025),
+    is_prime_from_file,
+]
+
+
+def verify_grid(lines: list[str]) -> dict:
+    """
+    Verifies one grid (one string per row) and returns a structured result
+    instead of raising. On failure, 'row' is the 0-indexed failing row
+    (None for grid-wide failures) and 'reason' says what went wrong.
+    """
+    rows = [parse_nums(line) for line in lines]
 
     # Verify each row against its corresponding check
-    for check, nums in zip(checks, rows):
-        assert all(check(n) for n in nums), f"Check failed on {nums}"
+    for row_idx, (check, nums) in enumerate(zip(CHECKS, rows)):
+        bad = [n for n in nums if not check(n)]
+        if bad:
+            return {"ok": False, "row": row_idx, "reason": f"Check failed on {bad}", "sum": None}
 
     # Ensure every number from the grid appears exactly once
     flat = [n for row in rows for n in row]
-    assert all(count == 1 for count in Counter(flat).values()), "Duplicate number found"
+    dupes = sorted(n for n, count in Counter(flat).items() if count > 1)
+    if dupes:
+        return {"ok": False, "row": None, "reason": f"Duplicate number found: {dupes}", "sum": None}
+
+    return {"ok": True, "row": None, "reason": None, "sum": sum(flat)}
+
+
+def iter_grids(stream, delimiter: str = ""):
+    """
+    Lazily yields grids (lists of row strings) from a line stream. Grids are
+    separated by lines equal to 'delimiter' after stripping (blank lines by
+    default); runs of delimiters are collapsed.
+    """
+    grid = []
+    for line in stream:
+        line = line.rstrip("\n")
+        if line.strip() == delimiter:
+            if grid:
+                yield grid
+                grid = []
+            continue
+        grid.append(line)
+    if grid:
+        yield grid
+
+
+def _verify_indexed(item: tuple[int, list[str]]) -> dict:
+    # A check that raises fails its own grid instead of aborting the whole stream
+    idx, lines = item
+    try:
+        return {"grid": idx, **verify_grid(lines)}
+    except Exception as e:
+        return {"grid": idx, "ok": False, "row": None, "reason": f"{type(e).__name__}: {e}", "sum": None}
+
+
+def stream_verify(stream, out=sys.stdout, delimiter: str = "", workers: int | None = None, batch_size: int = 256):
+    """
+    Verifies every grid in 'stream', writing one JSON result per grid to 'out'
+    in input order. Grids are read and dispatched in batches of 'batch_size',
+    so memory stays bounded regardless of input length.
+    Returns (number of grids, number of failures).
+    """
+    pool_size = workers or max(cpu_count() - 1, 1)
+    grids = enumerate(iter_grids(stream, delimiter))
+    total = failed = 0
+    with Pool(pool_size) as pool:
+        while True:
+            batch = list(islice(grids, batch_size))
+            if not batch:
+                break
+            chunksize = max(1, len(batch) // (pool_size * 4))
+            for result in pool.imap(_verify_indexed, batch, chunksize=chunksize):
+                total += 1
+                failed += not result["ok"]
+                out.write(json.dumps(result) + "\n")
+    return total, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify Number Cross 5 grids read from stdin.")
+    parser.add_argument("--stream", action="store_true",
+                        help="verify many delimiter-separated grids, one JSON result per line")
+    parser.add_argument("--delimiter", default="",
+                        help="line separating grids in --stream mode (default: blank line)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes in --stream mode")
+    parser.add_argument("--batch-size", type=int, default=256, help="grids in flight per batch in --stream mode")
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+
+    if args.stream:
+        _, failed = stream_verify(sys.stdin, sys.stdout, args.delimiter, args.workers, args.batch_size)
+        sys.exit(1 if failed else 0)
+
+    # Read all lines from stdin and verify them as a single grid (nodes: numbers checked)
+    lines = sys.stdin.read().splitlines()
+    params = {"lines": lines}
+    if args.cache is not None:
+        # Primality comes from PRIMES_PATH when it exists, so its contents are part of the key
+        params["primes"] = file_key(PRIMES_PATH)
+    result, hit = cached_solve(
+        "number_cross_5", SOLVER_VERSION, params,
+        lambda: (verify_grid(lines), sum(len(parse_nums(line)) for line in lines)), args.cache,
+    )
+    report_hit(hit)
+    assert result["ok"], result["reason"]
 
     # Output the final sum
-    print(sum(flat))
+    print(result["sum"])
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,138 @@
+"""
+Digit-DP candidate generators for the Number Cross 5 row constraints.
+
+Each generator yields, in increasing order, the numbers of a given length
+that satisfy one row's hint (digit product, multiple of n, divisible by
+each digit, odd palindrome). digit_dp walks a small automaton over the
+digits and only extends prefixes that can still be completed, so the work
+follows the number of answers instead of 10^length. ROW_GENERATORS maps
+the rows of number_cross_5_verification.CHECKS to their generators.
+"""
+import argparse
+from functools import lru_cache, partial
+from itertools import islice, product
+from math import lcm
+from operator import mul
+from typing import Callable, Hashable, Iterable, Iterator, Optional
+
+# Numbers in a Number Cross grid never contain 0 (parse_nums splits on zeros)
+DIGITS = tuple(range(1, 10))
+
+
+def digit_dp(length: int, start: Hashable, step: Callable, accept: Callable,
+             digits: Iterable[int] = DIGITS) -> Iterator[int]:
+    """
+    Yields, in increasing order, every 'length'-digit number (no leading zero)
+    whose digits drive the automaton start --step(state, digit)--> ... to a
+    state for which accept(state) holds. step returns None for a dead digit.
+
+    Whether a state can still be completed with k more digits is memoized,
+    and only completable prefixes are extended, so the work is proportional
+    to the output (times length * len(digits)) rather than to 10^length.
+    """
+    digits = tuple(sorted(digits))
+
+    @lru_cache(maxsize=None)
+    def options(k: int, state) -> tuple:
+        """(digit, next state) pairs that leave a completable state with k - 1 digits to go."""
+        found = []
+        for d in digits:
+            nxt = step(state, d)
+            if nxt is not None and (accept(nxt) if k == 1 else options(k - 1, nxt)):
+                found.append((d, nxt))
+        return tuple(found)
+
+    if length <= 0:
+        return
+    # Depth-first with an explicit stack (children pushed in reverse to keep increasing order)
+    stack = [(length, start, 0)]
+    while stack:
+        k, state, prefix = stack.pop()
+        opts = options(k, state)
+        if k == length:
+            opts = tuple(o for o in opts if o[0] != 0)
+        if k == 1:
+            for d, _ in opts:
+                yield prefix * 10 + d
+        else:
+            stack.extend((k - 1, nxt, prefix * 10 + d) for d, nxt in reversed(opts))
+
+
+def with_digit_product(target: int, length: int, digits: Iterable[int] = DIGITS) -> Iterator[int]:
+    """'length'-digit numbers whose digits multiply to 'target' (> 0)."""
+    if target <= 0:
+        raise ValueError("Target product must be positive")
+    # State: the part of the product still to be made
+    return digit_dp(length, target, lambda rest, d: rest // d if d and rest % d == 0 else None,
+                    lambda rest: rest == 1, digits)
+
+
+def multiples_of(divisor: int, length: int, digits: Iterable[int] = DIGITS) -> Iterator[int]:
+    """'length'-digit multiples of 'divisor'."""
+    # State: the prefix modulo the divisor
+    return digit_dp(length, 0, lambda r, d: (r * 10 + d) % divisor, lambda r: r == 0, digits)
+
+
+def divisible_by_each_digit(length: int, digits: Iterable[int] = DIGITS) -> Iterator[int]:
+    """'length'-digit numbers divisible by each of their (nonzero) digits."""
+    # State: (prefix mod 2520, lcm of the digits so far); every digit lcm divides 2520
+    return digit_dp(
+        length, (0, 1),
+        lambda s, d: ((s[0] * 10 + d) % 2520, lcm(s[1], d) if d else s[1]),
+        lambda s: s[0] % s[1] == 0,
+        digits,
+    )
+
+
+def odd_palindromes(length: int, digits: Iterable[int] = DIGITS) -> Iterator[int]:
+    """'length'-digit palindromes with an odd leading digit, built from their first half."""
+    digits = tuple(sorted(digits))
+    if length <= 0:
+        return
+    half, middle = divmod(length, 2)
+    # Weight of each head digit: its own place plus the place of its mirror image
+    weights = [10 ** (length - 1 - i) + (10 ** i if i < half else 0) for i in range(half + middle)]
+    leading = [d for d in digits if d % 2 == 1]
+    for first in leading:
+        base = first * weights[0]
+        for rest in product(digits, repeat=half + middle - 1):
+            yield base + sum(map(mul, rest, weights[1:]))
+
+
+# Generators for the rows of number_cross_5_verification.CHECKS (None where there is none)
+ROW_GENERATORS: list[Optional[Callable[[int], Iterator[int]]]] = [
+    None,
+    partial(with_digit_product, 20),
+    partial(multiples_of, 13),
+    partial(multiples_of, 32),
+    divisible_by_each_digit,
+    partial(with_digit_product, 25),
+    divisible_by_each_digit,
+    odd_palindromes,
+    None,
+    partial(with_digit_product, 2025),
+    None,
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enumerate Number Cross 5 row candidates of a given length.")
+    parser.add_argument("row", type=int, help="0-indexed row of the puzzle hints")
+    parser.add_argument("length", type=int, help="number of digits")
+    parser.add_argument("--limit", type=int, default=None, help="print at most this many")
+    parser.add_argument("--count", action="store_true", help="only print how many there are")
+    args = parser.parse_args()
+
+    generate = ROW_GENERATORS[args.row]
+    if generate is None:
+        parser.error(f"No generator for row {args.row}")
+    numbers = islice(generate(args.length), args.limit)
+    if args.count:
+        print(sum(1 for _ in numbers))
+        return
+    for n in numbers:
+        print(n)
+
+
+if __name__ == "__main__":
+    main()
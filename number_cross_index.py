@@ -0,0 +1,171 @@
+"""
+Per-column digit index over Number Cross 5 row candidates.
+
+row_candidates expands a row's shading template into every digit string
+the row's generator allows, and RowIndex keeps, for each (column, digit),
+the bitset of candidates with that digit there plus live counts. A cross
+solver can then ask which digits a column still allows, filter the row by
+a fixed cell or a used number, and undo filters when it backtracks.
+"""
+import argparse
+from itertools import product
+from typing import Callable, Iterable, Iterator, Sequence
+
+from number_cross_5_verification import parse_nums
+from number_cross_candidates import ROW_GENERATORS
+
+DIGIT_VALUES = bytes.maketrans(b"0123456789", bytes(range(10)))
+
+
+def set_bits(mask: int) -> Iterator[int]:
+    """Indices of the set bits of a (possibly very large) int, in increasing order."""
+    data = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+    for i, byte in enumerate(data):
+        while byte:
+            low = byte & -byte
+            yield 8 * i + low.bit_length() - 1
+            byte ^= low
+
+
+def indices_to_mask(indices: Iterable[int]) -> int:
+    indices = list(indices)
+    bitmap = bytearray(max(indices, default=-1) // 8 + 1)
+    for i in indices:
+        bitmap[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bitmap, "little")
+
+
+def row_candidates(generate: Callable[[int], Iterable[int]], shading: str) -> Iterator[str]:
+    """
+    Row strings for a fixed shading ('0' marks a shaded cell, anything else
+    an open one): every run of open cells is filled with one number from
+    generate(run length), e.g. a number_cross_candidates generator.
+    """
+    runs = [len(run) for run in shading.split("0")]
+    choices = [[str(n) for n in generate(length)] if length else [""] for length in runs]
+    for numbers in product(*choices):
+        yield "0".join(numbers)
+
+
+class RowIndex:
+    """
+    Index over one row's candidate digit strings, all of the same width.
+
+    For every (column, digit) it keeps the bitset of candidates with that
+    digit there, and for the candidates still alive, how many have each
+    digit in each column. possible(j) is therefore a lookup, and filters
+    (restrict, fix, exclude_number) cost O(removed candidates * width).
+    Every filter pushes one entry that undo() reverts, so a solver can
+    branch and backtrack on it.
+    """
+
+    def __init__(self, candidates: Sequence[str]):
+        self.candidates = list(candidates)
+        if not self.candidates:
+            raise ValueError("A row needs at least one candidate")
+        self.width = len(self.candidates[0])
+        if any(len(c) != self.width for c in self.candidates):
+            raise ValueError("Candidates must all have the same width")
+        self.digits = [c.encode().translate(DIGIT_VALUES) for c in self.candidates]
+
+        # Built as byte bitmaps first: or-ing single bits into big ints would be quadratic
+        size_bytes = (len(self.candidates) + 7) // 8
+        cells = [[bytearray(size_bytes) for _ in range(10)] for _ in range(self.width)]
+        numbers: dict[int, list[int]] = {}
+        for i, (candidate, digits) in enumerate(zip(self.candidates, self.digits)):
+            byte, bit = i >> 3, 1 << (i & 7)
+            for j, d in enumerate(digits):
+                cells[j][d][byte] |= bit
+            for n in parse_nums(candidate):
+                numbers.setdefault(n, []).append(i)
+        self.by_cell = [[int.from_bytes(bitmap, "little") for bitmap in cell] for cell in cells]
+        self.by_number = {n: indices_to_mask(indices) for n, indices in numbers.items()}
+
+        self.alive = (1 << len(self.candidates)) - 1
+        self.size = len(self.candidates)
+        self.counts = [[cell[d].bit_count() for d in range(10)] for cell in self.by_cell]
+        self.digit_masks = [sum(1 << d for d in range(10) if cell[d]) for cell in self.counts]
+        self.history: list[int] = []
+
+    def __len__(self) -> int:
+        return self.size
+
+    # ---- queries ----
+    def possible(self, j: int) -> int:
+        """Bitmask of the digits (bit d for digit d) some alive candidate has in column j."""
+        return self.digit_masks[j]
+
+    def possible_digits(self, j: int) -> list[int]:
+        return [d for d in range(10) if self.digit_masks[j] >> d & 1]
+
+    def count(self, j: int, d: int) -> int:
+        """How many alive candidates have digit d in column j."""
+        return self.counts[j][d]
+
+    def alive_candidates(self) -> Iterator[str]:
+        return (self.candidates[i] for i in set_bits(self.alive))
+
+    # ---- filters ----
+    def _remove(self, mask: int) -> bool:
+        mask &= self.alive
+        self.history.append(mask)
+        if mask:
+            self.alive &= ~mask
+            for i in set_bits(mask):
+                self.size -= 1
+                for j, d in enumerate(self.digits[i]):
+                    self.counts[j][d] -= 1
+                    if not self.counts[j][d]:
+                        self.digit_masks[j] &= ~(1 << d)
+        return self.size > 0
+
+    def restrict(self, j: int, digit_mask: int) -> bool:
+        """Keep the candidates whose digit in column j is in 'digit_mask'; False if none are left."""
+        keep = 0
+        for d in range(10):
+            if digit_mask >> d & 1:
+                keep |= self.by_cell[j][d]
+        return self._remove(self.alive & ~keep)
+
+    def fix(self, j: int, d: int) -> bool:
+        return self.restrict(j, 1 << d)
+
+    def exclude_number(self, n: int) -> bool:
+        """Drop the candidates containing the number n (already used elsewhere in the grid)."""
+        return self._remove(self.by_number.get(n, 0))
+
+    def undo(self):
+        """Revert the most recent filter."""
+        mask = self.history.pop()
+        if mask:
+            self.alive |= mask
+            for i in set_bits(mask):
+                self.size += 1
+                for j, d in enumerate(self.digits[i]):
+                    if not self.counts[j][d]:
+                        self.digit_masks[j] |= 1 << d
+                    self.counts[j][d] += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the digits still possible per column of a Number Cross 5 row.")
+    parser.add_argument("row", type=int, help="0-indexed row of the puzzle hints")
+    parser.add_argument("shading", help="row template, '0' for shaded cells and '.' for open ones (e.g. ...0.......)")
+    parser.add_argument("--fix", nargs="*", default=[], metavar="COL=DIGIT", help="cells to fix, in order")
+    args = parser.parse_args()
+
+    generate = ROW_GENERATORS[args.row]
+    if generate is None:
+        parser.error(f"No generator for row {args.row}")
+    index = RowIndex(list(row_candidates(generate, args.shading)))
+    print(f"{len(index)} candidates")
+    for item in args.fix:
+        col, digit = map(int, item.split("="))
+        index.fix(col, digit)
+        print(f"after {col}={digit}: {len(index)} candidates")
+    for j in range(index.width):
+        print(f"column {j}: {''.join(map(str, index.possible_digits(j)))}")
+
+
+if __name__ == "__main__":
+    main()
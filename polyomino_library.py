@@ -0,0 +1,256 @@
+"""
+Polyomino shape library: canonical orientations, symmetry classes and
+placement masks, computed once and persisted to a small JSON cache.
+
+A shape is any set of (r, c) cells. Its orientations are the distinct images
+under the eight rotations/reflections of the square, each normalized to
+min r = min c = 0 and stored as a sorted tuple; the canonical form is the
+smallest of them. Placement masks use the same bit layout as hooks_bitboard
+(cell (r, c) is bit r * size + c).
+
+The cache file (.polyomino_cache.json next to this module, ignored by git)
+holds orientations per canonical shape and placement masks per
+(shape, grid size). It is keyed by CACHE_VERSION and silently rebuilt when
+missing, stale or unreadable; if the directory is read-only the library
+simply works from memory. Importing the module touches no files: the
+library is created on first use, and entries are computed (and written
+back) as they are asked for. Running the module warms the Hooks shapes in
+one write.
+"""
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+import json
+import os
+
+Cell = Tuple[int, int]
+Shape = Tuple[Cell, ...]
+
+CACHE_VERSION = 1
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".polyomino_cache.json")
+
+# The 12 free pentominoes (any orientation; normalized on use)
+PENTOMINOES: Dict[str, Shape] = {
+    "F": ((0, 1), (0, 2), (1, 0), (1, 1), (2, 1)),
+    "I": ((0, 0), (1, 0), (2, 0), (3, 0), (4, 0)),
+    "L": ((0, 0), (1, 0), (2, 0), (3, 0), (3, 1)),
+    "N": ((0, 0), (1, 0), (1, 1), (2, 1), (3, 1)),
+    "P": ((0, 0), (0, 1), (1, 0), (1, 1), (2, 0)),
+    "T": ((0, 0), (0, 1), (0, 2), (1, 1), (2, 1)),
+    "U": ((0, 0), (0, 2), (1, 0), (1, 1), (1, 2)),
+    "V": ((0, 0), (1, 0), (2, 0), (2, 1), (2, 2)),
+    "W": ((0, 0), (1, 0), (1, 1), (2, 1), (2, 2)),
+    "X": ((0, 1), (1, 0), (1, 1), (1, 2), (2, 1)),
+    "Y": ((0, 1), (1, 0), (1, 1), (2, 1), (3, 1)),
+    "Z": ((0, 0), (0, 1), (1, 1), (2, 1), (2, 2)),
+}
+
+# The eight symmetries of the square as (r, c) -> (r', c')
+TRANSFORMS = (
+    ("id", lambda r, c: (r, c)),
+    ("rot90", lambda r, c: (c, -r)),
+    ("rot180", lambda r, c: (-r, -c)),
+    ("rot270", lambda r, c: (-c, r)),
+    ("flip_v", lambda r, c: (r, -c)),     # mirror across the vertical axis
+    ("flip_h", lambda r, c: (-r, c)),     # mirror across the horizontal axis
+    ("flip_main", lambda r, c: (c, r)),   # mirror across the main diagonal
+    ("flip_anti", lambda r, c: (-c, -r)), # mirror across the anti-diagonal
+)
+
+
+class ShapeInfo(NamedTuple):
+    canonical: Shape
+    orientations: Tuple[Shape, ...]  # distinct orientations, sorted
+    symmetries: Tuple[str, ...]      # transforms mapping the shape onto itself
+
+
+def normalize(cells: Iterable[Cell]) -> Shape:
+    """Shift so min r = 0 and min c = 0; return the cells as a sorted tuple."""
+    cells = list(cells)
+    min_r = min(r for r, _ in cells)
+    min_c = min(c for _, c in cells)
+    return tuple(sorted((r - min_r, c - min_c) for r, c in cells))
+
+
+def l_hook(width: int) -> Shape:
+    """The width-k hook: an L with two arms of length k sharing the corner cell."""
+    return tuple(sorted({(0, c) for c in range(width)} | {(r, 0) for r in range(width)}))
+
+
+def _images(cells: Shape) -> List[Shape]:
+    return [normalize(f(r, c) for r, c in cells) for _, f in TRANSFORMS]
+
+
+def _compute(cells: Shape) -> ShapeInfo:
+    canonical = min(_images(cells))
+    images = _images(canonical)
+    # Symmetries are taken relative to the canonical orientation, so that
+    # every orientation of a shape reports the same group
+    symmetries = tuple(name for (name, _), image in zip(TRANSFORMS, images) if image == canonical)
+    return ShapeInfo(canonical, tuple(sorted(set(images))), symmetries)
+
+
+def _key(shape: Shape) -> str:
+    return ";".join(f"{r},{c}" for r, c in shape)
+
+
+def _unkey(key: str) -> Shape:
+    return tuple(tuple(int(v) for v in cell.split(",")) for cell in key.split(";"))
+
+
+class ShapeLibrary:
+    """
+    Memoizes shape geometry in memory and mirrors it to a JSON file.
+
+    Orientations and symmetries are stored per canonical shape (so every
+    orientation of a shape hits the same entry); placement masks are stored
+    per canonical shape and grid size. New entries are written back right
+    away, which happens at most once per shape and size.
+    """
+
+    def __init__(self, path: str = CACHE_PATH):
+        self.path = path
+        self.shapes: Dict[str, ShapeInfo] = {}
+        self.masks: Dict[str, Tuple[int, ...]] = {}
+        self._aliases: Dict[str, str] = {}  # any orientation -> canonical key (memory only)
+        self._deferred = False
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            if data.get("version") != CACHE_VERSION:
+                return
+            shapes = {
+                key: ShapeInfo(_unkey(key), tuple(_unkey(o) for o in entry["orientations"]),
+                               tuple(entry["symmetries"]))
+                for key, entry in data.get("shapes", {}).items()
+            }
+            masks = {key: tuple(int(m) for m in key_masks) for key, key_masks in data.get("masks", {}).items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            # Unreadable, not JSON, or JSON of the wrong shape: start empty
+            return
+        self.shapes, self.masks = shapes, masks
+
+    def _save(self):
+        data = {
+            "version": CACHE_VERSION,
+            "shapes": {
+                key: {"orientations": [_key(o) for o in info.orientations], "symmetries": list(info.symmetries)}
+                for key, info in self.shapes.items()
+            },
+            "masks": {key: list(masks) for key, masks in self.masks.items()},
+        }
+        if self._deferred:
+            self._dirty = True
+            return
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def warm(self, shapes: Iterable[Iterable[Cell]], sizes: Iterable[int] = ()) -> None:
+        """Make sure the shapes (and their masks for each size) are cached, writing the file at most once."""
+        sizes = list(sizes)
+        self._deferred, self._dirty = True, False
+        try:
+            for cells in shapes:
+                cells = list(cells)
+                self.info(cells)
+                for size in sizes:
+                    self.placement_masks(cells, size)
+        finally:
+            self._deferred = False
+        if self._dirty:
+            self._save()
+
+    def info(self, cells: Iterable[Cell]) -> ShapeInfo:
+        """Orientations and symmetries of any polyomino (in any orientation or position)."""
+        cells = normalize(cells)
+        given = _key(cells)
+        key = self._aliases.get(given, given)
+        info = self.shapes.get(key)
+        if info is not None:
+            return info
+        info = _compute(cells)
+        key = _key(info.canonical)
+        self._aliases[given] = key
+        if key not in self.shapes:
+            self.shapes[key] = info
+            self._save()
+        return self.shapes[key]
+
+    def placement_masks(self, cells: Iterable[Cell], size: int) -> Tuple[int, ...]:
+        """Every in-bounds placement of the shape (all orientations) on a size x size grid, sorted."""
+        info = self.info(cells)
+        key = f"{size}:{_key(info.canonical)}"
+        masks = self.masks.get(key)
+        if masks is None:
+            found = set()
+            for orient in info.orientations:
+                h = max(r for r, _ in orient) + 1
+                w = max(c for _, c in orient) + 1
+                base = 0
+                for r, c in orient:
+                    base |= 1 << (r * size + c)
+                for tr in range(size - h + 1):
+                    for tc in range(size - w + 1):
+                        found.add(base << (tr * size + tc))
+            masks = tuple(sorted(found))
+            self.masks[key] = masks
+            self._save()
+        return masks
+
+
+_library: Optional[ShapeLibrary] = None
+
+
+def library() -> ShapeLibrary:
+    """The shared library, loaded from the cache file on first use."""
+    global _library
+    if _library is None:
+        _library = ShapeLibrary()
+    return _library
+
+
+def shape_info(cells: Iterable[Cell]) -> ShapeInfo:
+    return library().info(cells)
+
+
+def orientations(cells: Iterable[Cell]) -> Tuple[Shape, ...]:
+    return library().info(cells).orientations
+
+
+def symmetry_class(cells: Iterable[Cell]) -> Tuple[str, ...]:
+    """Symmetry group of the shape, as the names of the transforms that fix it."""
+    return library().info(cells).symmetries
+
+
+def placement_masks(cells: Iterable[Cell], size: int) -> Tuple[int, ...]:
+    return library().placement_masks(cells, size)
+
+
+def pentomino(name: str) -> Shape:
+    try:
+        return PENTOMINOES[name]
+    except KeyError:
+        raise ValueError(f"Unknown pentomino: {name}") from None
+
+
+def main():
+    # The shapes the Hooks grid uses; after the first run this is a plain file read
+    library().warm(list(PENTOMINOES.values()) + [l_hook(k) for k in range(2, 10)], sizes=(9,))
+    for name, cells in PENTOMINOES.items():
+        info = shape_info(cells)
+        print(f"{name}: {len(info.orientations)} orientations, symmetries {', '.join(info.symmetries)}, "
+              f"{len(placement_masks(cells, 9))} placements on 9x9")
+    for width in range(2, 10):
+        print(f"hook {width}: {len(orientations(l_hook(width)))} orientations, "
+              f"{len(placement_masks(l_hook(width), 9))} placements on 9x9")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+from typing import Callable, NamedTuple, Sequence
+
+
+class IterationRecord(NamedTuple):
+    iteration: int
+    x: float
+    fx: float
+    method: str  # "newton", "bisection", "interpolation"
+    lo: float
+    hi: float
+
+
+class RootResult(NamedTuple):
+    root: float
+    iterations: int
+    history: list[IterationRecord]
+
+
+def horner(coeffs: Sequence[float], x: float) -> tuple[float, float]:
+    """
+    Evaluates a polynomial (highest power first) and its derivative at x
+    in a single Horner pass.
+    """
+    value = 0.0
+    slope = 0.0
+    for c in coeffs:
+        slope = slope * x + value
+        value = value * x + c
+    return value, slope
+
+
+def _check_bracket(f_lo: float, f_hi: float, lo: float, hi: float) -> None:
+    if f_lo * f_hi > 0:
+        raise ValueError(f"Bracket [{lo}, {hi}] does not contain a sign change (f={f_lo}, {f_hi})")
+
+
+def safeguarded_newton(
+    func_and_derivative: Callable[[float], tuple[float, float]],
+    bracket: tuple[float, float],
+    tolerance: float = 1e-10,
+    max_iterations: int = 200,
+) -> RootResult:
+    """
+    Find a root with Newton–Raphson, safeguarded by a bracket.
+
+    The bracket [lo, hi] is shrunk after every evaluation. A Newton step is
+    taken only if it lands strictly inside the bracket and at least halves the
+    previous step; otherwise (including a zero derivative) we bisect instead.
+    Convergence is therefore guaranteed for any continuous function with a
+    sign change on the bracket.
+
+    Args:
+        func_and_derivative: Returns (f(x), f′(x)).
+        bracket: Interval (lo, hi) with f(lo) and f(hi) of opposite sign.
+        tolerance: Convergence criterion for |Δx|.
+        max_iterations: Maximum allowed iterations before giving up.
+
+    Returns:
+        RootResult with the root, the number of iterations and per-iteration
+        diagnostics.
+
+    Raises:
+        ValueError: If the bracket does not contain a sign change.
+        RuntimeError: If the method fails to converge within max_iterations.
+    """
+    lo, hi = bracket
+    f_lo, _ = func_and_derivative(lo)
+    f_hi, _ = func_and_derivative(hi)
+    _check_bracket(f_lo, f_hi, lo, hi)
+    if f_lo == 0:
+        return RootResult(lo, 0, [])
+    if f_hi == 0:
+        return RootResult(hi, 0, [])
+    # Orient so that f(lo) < 0 < f(hi)
+    if f_lo > 0:
+        lo, hi = hi, lo
+
+    history: list[IterationRecord] = []
+    x = (lo + hi) / 2
+    prev_step = abs(hi - lo)
+    fx, dfx = func_and_derivative(x)
+
+    for iteration in range(1, max_iterations + 1):
+        if fx < 0:
+            lo = x
+        else:
+            hi = x
+
+        newton_ok = dfx != 0
+        if newton_ok:
+            x_new = x - fx / dfx
+            newton_ok = min(lo, hi) < x_new < max(lo, hi) and abs(x_new - x) < prev_step / 2
+        if newton_ok:
+            method = "newton"
+        else:
+            x_new = (lo + hi) / 2
+            method = "bisection"
+
+        prev_step, x = abs(x_new - x), x_new
+        fx, dfx = func_and_derivative(x)
+        history.append(IterationRecord(iteration, x, fx, method, min(lo, hi), max(lo, hi)))
+        if prev_step < tolerance or fx == 0:
+            return RootResult(x, iteration, history)
+
+    raise RuntimeError(f"No convergence after {max_iterations} iterations")
+
+
+def brent(
+    func: Callable[[float], float],
+    bracket: tuple[float, float],
+    tolerance: float = 1e-10,
+    max_iterations: int = 200,
+) -> RootResult:
+    """
+    Find a root with Brent's method (inverse quadratic interpolation and
+    secant steps, falling back to bisection). Needs no derivative.
+
+    Raises:
+        ValueError: If the bracket does not contain a sign change.
+        RuntimeError: If the method fails to converge within max_iterations.
+    """
+    a, b = bracket
+    fa, fb = func(a), func(b)
+    _check_bracket(fa, fb, a, b)
+    if abs(fa) < abs(fb):
+        a, b, fa, fb = b, a, fb, fa
+    c, fc = a, fa
+    d = e = b - a
+    history: list[IterationRecord] = []
+
+    for iteration in range(1, max_iterations + 1):
+        if fb == 0:
+            return RootResult(b, iteration - 1, history)
+
+        tol = 2e-16 * abs(b) + tolerance / 2
+        m = (c - b) / 2
+        if abs(m) <= tol:
+            return RootResult(b, iteration - 1, history)
+
+        method = "bisection"
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                p, q = 2 * m * s, 1 - s
+            else:
+                q, r = fa / fc, fb / fc
+                p = s * (2 * m * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * m * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+                method = "interpolation"
+        if method == "bisection":
+            d = e = m
+
+        a, fa = b, fb
+        b += d if abs(d) > tol else (tol if m > 0 else -tol)
+        x, fx = b, func(b)
+        fb = fx
+        # Keep the sign change between b and c, with b the better end
+        if fb * fc > 0:
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        history.append(IterationRecord(iteration, x, fx, method, min(b, c), max(b, c)))
+
+    raise RuntimeError(f"No convergence after {max_iterations} iterations")
+
+
+def polynomial_root(
+    coeffs: Sequence[float],
+    bracket: tuple[float, float],
+    method: str = "newton",
+    tolerance: float = 1e-10,
+    max_iterations: int = 200,
+) -> RootResult:
+    """
+    Find a root of a polynomial (coefficients highest power first) inside a
+    bracket. The derivative is obtained from the coefficients, and both are
+    evaluated with Horner's scheme.
+    """
+    coeffs = tuple(float(c) for c in coeffs)
+    if method == "newton":
+        return safeguarded_newton(lambda x: horner(coeffs, x), bracket, tolerance, max_iterations)
+    if method == "brent":
+        return brent(lambda x: horner(coeffs, x)[0], bracket, tolerance, max_iterations)
+    raise ValueError(f"Unknown method: {method}")
+
@@ -0,0 +1,187 @@
+"""
+Content-addressed cache of solver results, shared by the solver scripts.
+
+Results live in one SQLite file, keyed by the SHA-256 of a canonical JSON
+encoding of (solver name, solver version, instance parameters). Bumping a
+solver's SOLVER_VERSION therefore invalidates its old entries without
+touching anyone else's. Each entry stores the JSON result with the wall
+time and node count of the run that produced it. When the stored results
+exceed 'max_bytes', the least recently used entries are evicted.
+
+The scripts only use the cache when run with --cache, and the file defaults
+to .solve_cache.sqlite next to this module (ignored by git), whatever the
+working directory. A result that depends on a file must put file_key(path)
+into its parameters, so editing the file misses the old entries.
+"""
+from typing import Any, Callable, NamedTuple, Optional, Tuple
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+
+DEFAULT_PATH = os.environ.get(
+    "SOLVE_CACHE", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".solve_cache.sqlite")
+)
+DEFAULT_MAX_BYTES = 64 << 20
+
+
+class CacheEntry(NamedTuple):
+    result: Any
+    seconds: float
+    nodes: Optional[int]
+    created: float
+
+
+def canonical_json(value) -> str:
+    """Key-sorted compact JSON (tuples become lists), so equal instances hash equally."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def instance_key(solver: str, version, params) -> str:
+    return hashlib.sha256(canonical_json([solver, str(version), params]).encode()).hexdigest()
+
+
+def file_key(path: str) -> dict:
+    """The absolute path and SHA-256 of a file a result depends on (None if the file is missing)."""
+    path = os.path.abspath(path)
+    if not os.path.exists(path):
+        return {"path": path, "sha256": None}
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return {"path": path, "sha256": digest.hexdigest()}
+
+
+class SolveCache:
+    def __init__(self, path: str = DEFAULT_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY, solver TEXT, version TEXT, params TEXT, result TEXT,"
+            " seconds REAL, nodes INTEGER, size INTEGER, created REAL, last_used REAL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        self.db.commit()
+
+    def get(self, solver: str, version, params) -> Optional[CacheEntry]:
+        key = instance_key(solver, version, params)
+        row = self.db.execute(
+            "SELECT result, seconds, nodes, created FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self.db.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        self.db.commit()
+        return CacheEntry(json.loads(row[0]), row[1], row[2], row[3])
+
+    def put(self, solver: str, version, params, result, seconds: float, nodes: Optional[int] = None):
+        key = instance_key(solver, version, params)
+        params_json, result_json = canonical_json(params), canonical_json(result)
+        now = time.time()
+        self.db.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, solver, str(version), params_json, result_json, seconds, nodes,
+             len(params_json) + len(result_json), now, now),
+        )
+        self.evict()
+        self.db.commit()
+
+    def evict(self):
+        """Drop least recently used entries until the stored size fits 'max_bytes'."""
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        doomed, freed = [], 0
+        for key, size in self.db.execute("SELECT key, size FROM results ORDER BY last_used"):
+            if freed >= excess:
+                break
+            doomed.append((key,))
+            freed += size
+        self.db.executemany("DELETE FROM results WHERE key = ?", doomed)
+
+    def stats(self) -> dict:
+        rows = self.db.execute(
+            "SELECT solver, version, COUNT(*), SUM(size), SUM(seconds) FROM results GROUP BY solver, version"
+        ).fetchall()
+        return {f"{solver} v{version}": {"entries": n, "bytes": size, "solve seconds": round(seconds, 3)}
+                for solver, version, n, size, seconds in rows}
+
+    def clear(self, solver: Optional[str] = None):
+        if solver is None:
+            self.db.execute("DELETE FROM results")
+        else:
+            self.db.execute("DELETE FROM results WHERE solver = ?", (solver,))
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+
+def cached_solve(
+    solver: str,
+    version,
+    params,
+    compute: Callable[[], Tuple[Any, Optional[int]]],
+    cache_path: Optional[str] = None,
+    keep: Optional[Callable[[Any], bool]] = None,
+) -> Tuple[Any, Optional[CacheEntry]]:
+    """
+    The cached result for this instance, or compute() -> (result, nodes)
+    stored for next time. Returns (result, entry), where entry is the cache
+    hit (None on a miss). cache_path=None bypasses the cache. A fresh result
+    for which keep(result) is false (e.g. an inconclusive one) is not stored.
+    """
+    if cache_path is None:
+        return compute()[0], None
+    cache = SolveCache(cache_path)
+    try:
+        entry = cache.get(solver, version, params)
+        if entry is not None:
+            return entry.result, entry
+        start = time.perf_counter()
+        result, nodes = compute()
+        if keep is not None and not keep(result):
+            return result, None
+        cache.put(solver, version, params, result, time.perf_counter() - start, nodes)
+        return result, None
+    finally:
+        cache.close()
+
+
+def add_cache_arguments(parser: argparse.ArgumentParser):
+    """The --cache option the solver scripts share; without it they always solve from scratch."""
+    parser.add_argument("--cache", nargs="?", const=DEFAULT_PATH, default=None, metavar="PATH",
+                        help=f"reuse and store results in a solved-instance cache (default file: {DEFAULT_PATH})")
+
+
+def report_hit(entry: Optional[CacheEntry]):
+    if entry is not None:
+        nodes = "" if entry.nodes is None else f", {entry.nodes} nodes"
+        print(f"(cached result from {time.strftime('%Y-%m-%d %H:%M', time.localtime(entry.created))}: "
+              f"originally {entry.seconds:.2f}s{nodes})", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or clear the solved-instance cache.")
+    parser.add_argument("--path", default=DEFAULT_PATH)
+    parser.add_argument("--clear", nargs="?", const="", default=None, metavar="SOLVER",
+                        help="delete every entry, or only those of SOLVER")
+    args = parser.parse_args()
+
+    cache = SolveCache(args.path)
+    if args.clear is not None:
+        cache.clear(args.clear or None)
+    for name, info in cache.stats().items():
+        print(name, info)
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
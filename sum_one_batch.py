@@ -0,0 +1,92 @@
+"""
+Batched Newton-Raphson for the Sum One cubics.
+
+Solves (Eq. 9) from sum_one_solver.py for many thresholds k at once. Kept
+apart from sum_one_solver.py so the scalar solver runs without numpy.
+"""
+from typing import Callable
+
+import numpy as np
+
+
+def newton_raphson_batch(
+    func: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    derivative: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    initial_guess: np.ndarray | float = 0.5,
+    tolerance: float = 1e-10,
+    max_iterations: int = 100,
+    size: int | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Run Newton–Raphson on many independent problems in lockstep.
+
+    Each problem is identified by its index into the batch. Elements that have
+    converged (or hit a zero derivative) are frozen by a mask while the rest
+    keep iterating, so one slow element never perturbs the others.
+
+    Args:
+        func: Vectorized f(p, idx) evaluated at iterates p for problems idx.
+        derivative: Vectorized f′(p, idx) with the same calling convention.
+        initial_guess: Starting value(s), scalar or array broadcast to the batch.
+        tolerance: Per-element convergence criterion for |Δp|.
+        max_iterations: Maximum number of lockstep iterations.
+        size: Batch size; only needed if initial_guess is a scalar.
+
+    Returns:
+        (roots, converged): the final iterates and a boolean mask of the
+        elements that met the tolerance. Non-converged entries are left at
+        their last iterate rather than raising.
+    """
+    p = np.array(initial_guess, dtype=float, copy=True, ndmin=1)
+    if size is not None:
+        p = np.broadcast_to(p, (size,)).copy()
+    idx = np.arange(p.size)
+    converged = np.zeros(p.size, dtype=bool)
+    active = np.ones(p.size, dtype=bool)
+
+    for _ in range(max_iterations):
+        live = idx[active]
+        if live.size == 0:
+            break
+        f_val = func(p[live], live)
+        df_val = derivative(p[live], live)
+        stalled = df_val == 0
+        delta = np.divide(f_val, df_val, out=np.zeros_like(f_val), where=~stalled)
+        p[live] -= delta
+        done = ~stalled & (np.abs(delta) < tolerance)
+        converged[live[done]] = True
+        active[live[done | stalled]] = False
+
+    return p, converged
+
+
+def threshold_cubic_coefficients(k: np.ndarray | float) -> np.ndarray:
+    """
+    Coefficients (highest power first) of (Eq. 9), one row per threshold k.
+    """
+    k = np.asarray(k, dtype=float).reshape(-1)
+    return np.stack([2 * k - k**2, -(k + 2), np.full_like(k, 3.0), np.full_like(k, -1.0)], axis=1)
+
+
+def solve_threshold_sweep(
+    thresholds: np.ndarray,
+    initial_guess: float = 0.75,
+    tolerance: float = 1e-10,
+    max_iterations: int = 100,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Solve f(p) = k for every k in 'thresholds' at once.
+
+    Returns (roots, converged) as in newton_raphson_batch. Starting from
+    p = 0.75 keeps the iterates on the branch p > 1/2 where (Eq. 7) is a
+    valid probability.
+    """
+    a, b, c, d = threshold_cubic_coefficients(thresholds).T
+
+    def f(p: np.ndarray, i: np.ndarray) -> np.ndarray:
+        return ((a[i] * p + b[i]) * p + c[i]) * p + d[i]
+
+    def df(p: np.ndarray, i: np.ndarray) -> np.ndarray:
+        return (3 * a[i] * p + 2 * b[i]) * p + c[i]
+
+    return newton_raphson_batch(f, df, initial_guess, tolerance, max_iterations, size=a.size)
@@ -0,0 +1,136 @@
+# Monte Carlo check of the Sum One, Somewhere derivation in sum_one_solver.py.
+
+# Each node of an infinite binary tree is 0 with probability p and 1 otherwise.
+# We estimate the probability that some path from the root, truncated at a finite
+# depth, contains at most k ones (k = 1 for the puzzle).
+
+# Subtrees are independent and identically distributed, so a tree level is fully
+# described by how many live frontier nodes have used 0, 1, ..., k ones so far.
+# Rather than materializing 2^depth nodes, we propagate those counts level by
+# level with binomial draws, for a whole batch of trees at once:
+#   - the 2 * n_j children of the n_j nodes in state j split into
+#     Binomial(2 * n_j, p) zeros (stay in state j) and the rest (move to j + 1),
+#   - children that would exceed k ones are dropped.
+# A tree "survives" if any frontier node is still live at the final depth. The
+# truncated probability decreases to the infinite-tree value as depth grows.
+
+import argparse
+import math
+from multiprocessing import Pool, cpu_count
+from typing import NamedTuple
+
+import numpy as np
+
+# Frontier counts are clamped here; a supercritical population this large
+# essentially never dies out, and clamping keeps binomial draws in int64 range.
+COUNT_CAP = 1 << 40
+
+
+class Estimate(NamedTuple):
+    probability: float
+    low: float
+    high: float
+    successes: int
+    trials: int
+
+
+def simulate_batch(p: float, depth: int, trials: int, rng: np.random.Generator, max_ones: int = 1) -> int:
+    """
+    Simulates 'trials' independent trees of the given depth and returns how
+    many have a root-to-depth path with at most 'max_ones' ones.
+    """
+    counts = np.zeros((trials, max_ones + 1), dtype=np.int64)
+    root_is_zero = rng.random(trials) < p
+    counts[:, 0] = root_is_zero
+    if max_ones >= 1:
+        counts[:, 1] = ~root_is_zero
+
+    for _ in range(depth):
+        children = 2 * counts
+        zeros = rng.binomial(children, p)
+        ones = children - zeros
+        counts = zeros
+        counts[:, 1:] += ones[:, :-1]
+        np.minimum(counts, COUNT_CAP, out=counts)
+
+        # Only trees that are still alive need further levels
+        alive = counts.any(axis=1)
+        if not alive.all():
+            survivors = int(alive.sum())
+            if survivors == 0:
+                return 0
+            counts = counts[alive]
+
+    return int(counts.shape[0])
+
+
+def _run_stream(args: tuple[float, int, int, int, np.random.SeedSequence, int]) -> int:
+    p, depth, trials, batch_size, seed_seq, max_ones = args
+    rng = np.random.default_rng(seed_seq)
+    successes = 0
+    remaining = trials
+    while remaining > 0:
+        n = min(batch_size, remaining)
+        successes += simulate_batch(p, depth, n, rng, max_ones)
+        remaining -= n
+    return successes
+
+
+def wilson_interval(successes: int, trials: int, z: float = 1.96) -> tuple[float, float]:
+    """Wilson score confidence interval for a binomial proportion."""
+    if trials == 0:
+        return 0.0, 1.0
+    phat = successes / trials
+    denom = 1 + z**2 / trials
+    centre = (phat + z**2 / (2 * trials)) / denom
+    half = z * math.sqrt(phat * (1 - phat) / trials + z**2 / (4 * trials**2)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def estimate_probability(
+    p: float,
+    depth: int = 200,
+    trials: int = 200_000,
+    max_ones: int = 1,
+    workers: int | None = None,
+    seed: int | None = None,
+    batch_size: int = 50_000,
+    z: float = 1.96,
+) -> Estimate:
+    """
+    Estimates the probability of a path with at most 'max_ones' ones to the
+    given depth, splitting the trials over independent random streams (one
+    per worker, spawned from a single SeedSequence so runs are reproducible).
+    """
+    workers = workers or max(cpu_count() - 1, 1)
+    streams = np.random.SeedSequence(seed).spawn(workers)
+    share, extra = divmod(trials, workers)
+    jobs = [(p, depth, share + (i < extra), batch_size, streams[i], max_ones) for i in range(workers)]
+
+    if workers == 1:
+        successes = _run_stream(jobs[0])
+    else:
+        with Pool(workers) as pool:
+            successes = sum(pool.map(_run_stream, jobs))
+
+    low, high = wilson_interval(successes, trials, z)
+    return Estimate(successes / trials, low, high, successes, trials)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Monte Carlo estimate of the Sum One path probability.")
+    parser.add_argument("--p", type=float, default=0.5306035754, help="probability that a node is 0")
+    parser.add_argument("--depth", type=int, default=200)
+    parser.add_argument("--trials", type=int, default=200_000)
+    parser.add_argument("--max-ones", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    est = estimate_probability(args.p, args.depth, args.trials, args.max_ones, args.workers, args.seed)
+    print(f"p={args.p}: estimate {est.probability:.5f}  95% CI [{est.low:.5f}, {est.high:.5f}]  "
+          f"({est.successes}/{est.trials})")
+
+
+if __name__ == "__main__":
+    main()
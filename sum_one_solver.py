@@ -44,8 +44,19 @@
 # Now solve the cubic using numerical methods (Newton-Raphson) yields:
 # Root found: 0.5306035754
 
+# More generally, requiring f(p) = k instead of 1/2 gives the family of cubics:
+# (Eq. 9)       (2k - k^2) p^3 - (k + 2) p^2 + 3p - 1 = 0
+# which reduces to (Eq. 8) (scaled by 1/4) at k = 1/2.
+
+import argparse
 from typing import Callable
 
+from root_finding import polynomial_root
+from solve_cache import add_cache_arguments, cached_solve, report_hit
+
+# Bump when a change could alter results, so cached roots are not reused
+SOLVER_VERSION = 1
+
 def newton_raphson(
     func: Callable[[float], float],
     derivative: Callable[[float], float],
@@ -85,15 +96,22 @@ def newton_raphson(
 
 
 def main() -> None:
-    # Define the target function and its derivative
-    def f(p: float) -> float:
-        return 3 * p**3 - 10 * p**2 + 12 * p - 4
+    parser = argparse.ArgumentParser(description="Solve (Eq. 8) for p.")
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+
+    # (Eq. 8) as coefficients, highest power first. Only p in [1/2, 1] makes
+    # x in (Eq. 7) a probability, and the cubic changes sign on that bracket.
+    coeffs = (3, -10, 12, -4)
+    bracket = (0.5, 1.0)
 
-    def df(p: float) -> float:
-        return 9 * p**2 - 20 * p + 12
+    def solve():
+        result = polynomial_root(coeffs, bracket=bracket)
+        return result.root, result.iterations
 
     try:
-        root = newton_raphson(f, df, initial_guess=0.5)
+        root, hit = cached_solve("sum_one", SOLVER_VERSION, {"coeffs": coeffs, "bracket": bracket}, solve, args.cache)
+        report_hit(hit)
         print(f"Root found: {root:.10f}")
     except (ValueError, RuntimeError) as e:
         print(f"Computation error: {e}")
@@ -0,0 +1,65 @@
+import itertools
+
+import pytest
+
+from hooks_count import count_solutions, is_uniquely_solvable, iter_solutions
+from hooks_engine import enumerate_hook_digits, enumerate_hook_layouts
+from polyomino_library import pentomino, placement_masks
+
+SIZE = 4
+GIVENS = {(0, 0): 1}
+UNIQUE = {"L": 0, "U": 3}
+TWO = {"L": 0, "U": 0}
+
+
+def brute_force_count(givens, row_targets, size):
+    """Every hook layout, digit assignment and pair of placements, checked rule by rule."""
+    cells = [(r, c) for r in range(size) for c in range(size)]
+    placements = [
+        [frozenset(divmod(i, size) for i in range(size * size) if mask >> i & 1)
+         for mask in placement_masks(pentomino(name), size)]
+        for name in row_targets
+    ]
+    placements = [[p for p in ps if any(r == row for r, _ in p)] for ps, row in zip(placements, row_targets.values())]
+    one = next(cell for cell, d in givens.items() if d == 1)
+    total = 0
+    for hooks in enumerate_hook_layouts(one, size):
+        for digits in enumerate_hook_digits(hooks, givens):
+            for pieces in itertools.product(*placements):
+                if sum(len(p) for p in pieces) != len(frozenset().union(*pieces)):
+                    continue
+                filled = frozenset(givens).union(*pieces)
+                if any(len(hook & filled) != d for hook, d in zip(hooks, digits)):
+                    continue
+                if any({(r, c), (r + 1, c), (r, c + 1), (r + 1, c + 1)} <= filled
+                       for r in range(size - 1) for c in range(size - 1)):
+                    continue
+                empty = [cell for cell in cells if cell not in filled]
+                reached, todo = {empty[0]}, [empty[0]]
+                while todo:
+                    r, c = todo.pop()
+                    for n in ((r + 1, c), (r - 1, c), (r, c + 1), (r, c - 1)):
+                        if n in empty and n not in reached:
+                            reached.add(n)
+                            todo.append(n)
+                if len(reached) == len(empty):
+                    total += 1
+    return total
+
+
+@pytest.mark.parametrize("row_targets, expected", [(UNIQUE, 1), (TWO, 2)])
+def test_small_instance_counts(row_targets, expected):
+    shapes = tuple(row_targets)
+    assert brute_force_count(GIVENS, row_targets, SIZE) == expected
+    assert count_solutions(GIVENS, shapes, workers=1, row_targets=row_targets, size=SIZE) == expected
+    assert len(list(iter_solutions(GIVENS, shapes, row_targets, SIZE))) == expected
+    assert is_uniquely_solvable(GIVENS, shapes, workers=1, row_targets=row_targets, size=SIZE) == (expected == 1)
+
+
+def test_unrepresentable_instance_raises():
+    # The shipped instance: six pentominoes and five givens cannot fill 45 cells
+    with pytest.raises(ValueError, match="45 filled cells"):
+        count_solutions(workers=1)
+    with pytest.raises(ValueError):
+        is_uniquely_solvable(workers=1)
+    assert count_solutions(limit=5, workers=1, relaxed=True) == 5
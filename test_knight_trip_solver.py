@@ -0,0 +1,64 @@
+import knight_trip_solver
+from knight_trip_solver import (
+    CAPPED, EXHAUSTED, FOUND, SearchBudget, assign_values, build_tables, calculate_score, find_path_best_first,
+    find_path_dp, precompute_knight_moves, process_assignment, trip_moves, values_and_moves,
+)
+
+
+def check_trip(path, start, end, values):
+    assert path[0] == start and path[-1] == end
+    assert len(set(path)) == len(path)
+    assert all(b in precompute_knight_moves()[a] for a, b in zip(path, path[1:]))
+    assert calculate_score(path, values) == 2024
+
+
+def test_trip_moves_matches_worker_tables():
+    tables = build_tables()
+    values = assign_values(2, 5, 4)
+    assert trip_moves(values) == values_and_moves((2, 5, 4), tables[:36], tables[36:])[1]
+
+
+def test_process_assignment_dp_outside_pool():
+    A, B, C, success, solution = process_assignment((2, 5, 4), "dp", max_length=10)
+    assert (A, B, C, success) == (2, 5, 4, True)
+    values = assign_values(2, 5, 4)
+    check_trip(solution[0], (0, 0), (5, 5), values)
+    check_trip(solution[1], (0, 5), (5, 0), values)
+
+
+def test_process_assignment_dp_cap_is_unknown():
+    # Trips are still open at 8 cells, so the dp mode cannot rule this assignment out
+    assert process_assignment((1, 2, 3), "dp", max_length=8) == (1, 2, 3, None, None)
+
+
+def test_find_path_dp_exhausted_and_capped():
+    values = assign_values(1, 2, 3)
+    assert find_path_dp((0, 0), (5, 5), values, 10, max_length=36) == (EXHAUSTED, None)
+    assert find_path_dp((0, 0), (5, 5), values, 2024, max_length=8) == (CAPPED, None)
+
+
+def test_process_assignment_anytime():
+    A, B, C, success, solution = process_assignment((2, 3, 1), "anytime", time_budget=30)
+    assert success is True
+    values = assign_values(2, 3, 1)
+    check_trip(solution[0], (0, 0), (5, 5), values)
+    check_trip(solution[1], (0, 5), (5, 0), values)
+
+
+def test_process_assignment_anytime_timeout_is_unknown():
+    assert process_assignment((1, 2, 3), "anytime", node_budget=10) == (1, 2, 3, None, None)
+
+
+def test_best_first_budget():
+    values = assign_values(2, 5, 4)
+    status, path = find_path_best_first((0, 0), (5, 5), values, 2024, SearchBudget(nodes=100_000))
+    assert status == FOUND
+    check_trip(path, (0, 0), (5, 5), values)
+
+
+def test_process_assignment_bfs_uses_worker_tables(monkeypatch):
+    expected = process_assignment((2, 5, 4), "bfs")
+    assert expected[3] is True
+    tables = build_tables()
+    monkeypatch.setattr(knight_trip_solver, "worker_tables", (tables[:36], tables[36:]))
+    assert process_assignment((2, 5, 4), "bfs") == expected
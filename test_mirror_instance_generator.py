@@ -0,0 +1,55 @@
+import numpy as np
+
+from hall_of_mirrors_solver import is_diagonal_placement_possible
+from mirror_instance_generator import choose_clues, generate_batch, is_unique, off_path_cells
+from mirror_tracer import LASER_INDEX, arrangement_to_grid, trace_all
+
+# An instance the generator used to accept: its clued lasers cross every
+# mirror, but a '/' at (4.5, 3.5) meets every clue too
+MIRRORS = [
+    (0.5, 0.5, "\\"), (0.5, 8.5, "/"), (1.5, 1.5, "\\"), (1.5, 3.5, "\\"), (2.5, 5.5, "\\"), (3.5, 2.5, "\\"),
+    (3.5, 9.5, "/"), (4.5, 1.5, "\\"), (4.5, 7.5, "\\"), (5.5, 0.5, "\\"), (5.5, 4.5, "\\"), (5.5, 9.5, "/"),
+    (7.5, 4.5, "\\"), (8.5, 6.5, "/"), (9.5, 7.5, "/"), (9.5, 9.5, "\\"),
+]
+CLUED = [
+    ((0.5, -0.5), (0, 1)), ((3.5, -0.5), (0, 1)), ((4.5, -0.5), (0, 1)), ((5.5, -0.5), (0, 1)),
+    ((6.5, -0.5), (0, 1)), ((7.5, -0.5), (0, 1)), ((8.5, -0.5), (0, 1)), ((3.5, 10.5), (0, -1)),
+    ((5.5, 10.5), (0, -1)), ((7.5, 10.5), (0, -1)), ((8.5, 10.5), (0, -1)), ((9.5, 10.5), (0, -1)),
+    ((-0.5, 0.5), (1, 0)), ((-0.5, 1.5), (1, 0)), ((-0.5, 3.5), (1, 0)), ((-0.5, 4.5), (1, 0)),
+    ((-0.5, 6.5), (1, 0)), ((-0.5, 8.5), (1, 0)), ((-0.5, 9.5), (1, 0)), ((10.5, 0.5), (-1, 0)),
+    ((10.5, 2.5), (-1, 0)), ((10.5, 4.5), (-1, 0)), ((10.5, 5.5), (-1, 0)), ((10.5, 6.5), (-1, 0)),
+    ((10.5, 7.5), (-1, 0)), ((10.5, 9.5), (-1, 0)),
+]
+
+
+def layout(extra=()):
+    return {(x, y): (kind, None) for x, y, kind in MIRRORS + list(extra)}
+
+
+def test_free_cell_off_every_clued_path_is_caught():
+    grid = arrangement_to_grid(layout())
+    products, paths = trace_all(grid, return_paths=True)
+    clues = sorted(LASER_INDEX[laser] for laser in CLUED)
+    challenges = [{"origin": o, "vector": v, "target": int(products[LASER_INDEX[(o, v)]])} for o, v in CLUED]
+    # The relaxed search alone calls it unique, though a second layout meets the clues
+    assert is_unique(challenges, 200_000)
+    second = trace_all(arrangement_to_grid(layout([(4.5, 3.5, "/")])))
+    assert (second[clues] == products[clues]).all() and (second != products).any()
+    assert off_path_cells(grid, paths, clues)[4, 3]
+
+    chosen = choose_clues(grid, paths, np.random.default_rng(0), len(clues))
+    assert chosen is not None and not off_path_cells(grid, paths, chosen).any()
+
+
+def test_generated_instances_take_no_extra_mirror():
+    # The batch the counterexample came from; no instance may accept one more legal mirror
+    for instance in generate_batch((673228719, 32, (8, 20), 12, 200_000)):
+        base = {(x, y): (kind, None) for x, y, kind in instance["mirrors"]}
+        clues = [LASER_INDEX[(tuple(c["origin"]), tuple(c["vector"]))] for c in instance["clues"]]
+        targets = [c["target"] for c in instance["clues"]]
+        grids = [
+            arrangement_to_grid({**base, (x + 0.5, y + 0.5): (kind, None)})
+            for x in range(10) for y in range(10) for kind in "/\\"
+            if is_diagonal_placement_possible(base, x + 0.5, y + 0.5)
+        ]
+        assert not (trace_all(np.array(grids))[:, clues] == targets).all(axis=1).any()
@@ -0,0 +1,24 @@
+import json
+
+import pytest
+
+from polyomino_library import CACHE_VERSION, PENTOMINOES, ShapeLibrary
+
+
+@pytest.mark.parametrize("data", [
+    {"version": CACHE_VERSION, "shapes": {"0,0;0,1": {"symmetries": ["id"]}}},
+    {"version": CACHE_VERSION, "shapes": {"0,0;0,1": {"orientations": 3, "symmetries": ["id"]}}},
+    {"version": CACHE_VERSION, "shapes": [], "masks": {"9:0,0": None}},
+    {"version": CACHE_VERSION, "shapes": {"a,b": {"orientations": [], "symmetries": []}}},
+    [CACHE_VERSION],
+])
+def test_corrupt_cache_is_rebuilt(tmp_path, data):
+    path = tmp_path / "cache.json"
+    path.write_text(json.dumps(data))
+    library = ShapeLibrary(str(path))
+    assert library.shapes == {} and library.masks == {}
+    assert len(library.info(PENTOMINOES["X"]).orientations) == 1
+    assert len(library.placement_masks(PENTOMINOES["I"], 5)) == 10
+    # The rebuilt entries were written back and load cleanly
+    reloaded = ShapeLibrary(str(path))
+    assert reloaded.shapes == library.shapes and reloaded.masks == library.masks
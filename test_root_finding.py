@@ -0,0 +1,19 @@
+from root_finding import brent, polynomial_root
+
+
+def cubic(x):
+    return x ** 3 - 2 * x - 5
+
+
+def test_brent_history_brackets_the_root():
+    result = brent(cubic, (2.0, 3.0))
+    assert abs(cubic(result.root)) < 1e-9
+    for record in result.history:
+        assert record.lo <= record.x <= record.hi
+        assert cubic(record.lo) * cubic(record.hi) <= 0
+
+
+def test_polynomial_root_methods_agree():
+    newton = polynomial_root([1, 0, -2, -5], (2.0, 3.0))
+    brent_result = polynomial_root([1, 0, -2, -5], (2.0, 3.0), method="brent")
+    assert abs(newton.root - brent_result.root) < 1e-9
@@ -0,0 +1,77 @@
+import itertools
+
+import solve_cache
+from solve_cache import SolveCache, cached_solve, file_key
+
+
+def counting(result, nodes=None):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return result, nodes
+    return compute, calls
+
+
+def test_evicts_least_recently_used(tmp_path, monkeypatch):
+    clock = itertools.count(1)
+    monkeypatch.setattr(solve_cache.time, "time", lambda: next(clock))
+    cache = SolveCache(str(tmp_path / "cache.sqlite"), max_bytes=10 ** 6)
+    for name in "abc":
+        cache.put("s", 1, {"name": name}, "x" * 100, 0.1)
+    size = cache.db.execute("SELECT size FROM results LIMIT 1").fetchone()[0]
+    # 'a' is the oldest entry but was just read, so 'b' is now the least recently used
+    assert cache.get("s", 1, {"name": "a"}).result == "x" * 100
+    cache.max_bytes = 3 * size
+    cache.put("s", 1, {"name": "d"}, "x" * 100, 0.1)
+    assert cache.get("s", 1, {"name": "b"}) is None
+    assert all(cache.get("s", 1, {"name": name}) is not None for name in "acd")
+    cache.close()
+
+
+def test_version_bump_misses(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    compute, calls = counting([1, 2], nodes=7)
+    assert cached_solve("s", 1, {"n": 3}, compute, path) == ([1, 2], None)
+    result, entry = cached_solve("s", 1, {"n": 3}, compute, path)
+    assert result == [1, 2] and entry.nodes == 7 and len(calls) == 1
+    assert cached_solve("s", 2, {"n": 3}, compute, path) == ([1, 2], None)
+    assert len(calls) == 2
+    # Other solvers' entries survive the bump
+    assert cached_solve("t", 1, {"n": 3}, counting("t")[0], path)[0] == "t"
+    assert cached_solve("s", 1, {"n": 3}, compute, path)[1] is not None
+
+
+def test_keep_false_is_not_stored(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    compute, calls = counting(["timeout", None])
+    keep = lambda output: output[0] != "timeout"
+    for _ in range(2):
+        assert cached_solve("s", 1, {}, compute, path, keep=keep) == (["timeout", None], None)
+    assert len(calls) == 2
+    compute, calls = counting(["found", 5])
+    cached_solve("s", 1, {}, compute, path, keep=keep)
+    assert cached_solve("s", 1, {}, compute, path, keep=keep)[1] is not None
+    assert len(calls) == 1
+
+
+def test_no_cache_path_always_computes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    compute, calls = counting(42)
+    for _ in range(2):
+        assert cached_solve("s", 1, {}, compute, None) == (42, None)
+    assert len(calls) == 2 and list(tmp_path.iterdir()) == []
+
+
+def test_file_key_changes_with_contents(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    data = tmp_path / "primes.txt"
+    data.write_text("2 3 5")
+    compute, calls = counting("first")
+    cached_solve("s", 1, {"data": file_key(str(data))}, compute, path)
+    assert cached_solve("s", 1, {"data": file_key(str(data))}, compute, path)[1] is not None
+    data.write_text("2 3 5 7")
+    assert cached_solve("s", 1, {"data": file_key(str(data))}, compute, path)[1] is None
+    assert len(calls) == 2
+    data.unlink()
+    assert file_key(str(data)) == {"path": str(data), "sha256": None}
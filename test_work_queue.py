@@ -0,0 +1,132 @@
+import threading
+import time
+
+import pytest
+
+import work_queue
+from work_queue import Coordinator, run_worker
+
+
+def failing_job(payload, cancelled):
+    if payload["fail"]:
+        raise ValueError("bad unit")
+    return None
+
+
+def test_job_error_fails_unit_and_worker_continues(monkeypatch):
+    monkeypatch.setitem(work_queue.JOBS, "failing", failing_job)
+    coordinator = Coordinator("failing", [{"fail": False}, {"fail": True}, {"fail": False}],
+                              heartbeat_interval=0.2, stop_on_result=False)
+    host, port = coordinator.serve()
+    worker = threading.Thread(target=run_worker, args=(host, port))
+    worker.start()
+    try:
+        assert coordinator.wait(timeout=10, linger=0.5)
+        worker.join(timeout=10)
+    finally:
+        coordinator.shutdown()
+    assert coordinator.results == {0: None, 2: None}
+    assert coordinator.failed == [1]
+    assert coordinator.errors == {1: "ValueError: bad unit"}
+    assert coordinator.attempts[1] == 1
+
+
+def test_unknown_job_kind_is_reported():
+    coordinator = Coordinator("missing", [{}], heartbeat_interval=0.2)
+    host, port = coordinator.serve()
+    try:
+        assert run_worker(host, port) == 1
+        assert coordinator.wait(timeout=5)
+    finally:
+        coordinator.shutdown()
+    assert coordinator.failed == [0]
+    assert "unknown job kind" in coordinator.errors[0]
+
+
+def echo_job(payload, cancelled):
+    return payload.get("value")
+
+
+def test_expired_lease_is_requeued(monkeypatch):
+    monkeypatch.setitem(work_queue.JOBS, "echo", echo_job)
+    coordinator = Coordinator("echo", [{"value": None}, {"value": None}],
+                              lease_timeout=0.3, heartbeat_interval=0.1, stop_on_result=False)
+    # A worker that leases unit 0 and then disappears
+    assert coordinator.handle({"op": "get", "worker": "lost"})["unit"] == 0
+    host, port = coordinator.serve()
+    try:
+        assert run_worker(host, port, name="alive") == 2
+        assert coordinator.wait(timeout=10)
+    finally:
+        coordinator.shutdown()
+    assert coordinator.results == {0: None, 1: None}
+    assert coordinator.attempts == [2, 1]
+    assert coordinator.failed == []
+
+
+def test_heartbeat_renews_only_the_current_lease():
+    coordinator = Coordinator("echo", [{}, {}], lease_timeout=0.3, heartbeat_interval=0.1)
+    assert coordinator.handle({"op": "get", "worker": "a"})["unit"] == 0
+    for _ in range(5):
+        time.sleep(0.1)
+        coordinator.handle({"op": "heartbeat", "worker": "a", "unit": 0})
+    # Half a second in, the heartbeats have kept unit 0 leased to a
+    assert coordinator.handle({"op": "get", "worker": "b"})["unit"] == 1
+    coordinator.handle({"op": "result", "worker": "b", "unit": 1, "result": None})
+    time.sleep(0.4)
+    # a went quiet: its lease expired, and b picks unit 0 up
+    assert coordinator.handle({"op": "get", "worker": "b"})["unit"] == 0
+    # A late heartbeat from a must not take the unit back from b
+    coordinator.handle({"op": "heartbeat", "worker": "a", "unit": 0})
+    assert coordinator.leases[0][0] == "b"
+
+
+def test_unit_fails_after_max_attempts():
+    coordinator = Coordinator("echo", [{}], lease_timeout=0.1, max_attempts=2)
+    for attempt in (1, 2):
+        assert coordinator.handle({"op": "get", "worker": f"w{attempt}"})["unit"] == 0
+        time.sleep(0.15)
+    assert coordinator.handle({"op": "get", "worker": "w3"}) == {"stop": True}
+    assert coordinator.failed == [0]
+    assert coordinator.attempts == [2]
+
+
+slow_job_cancelled = threading.Event()
+
+
+def slow_or_fast_job(payload, cancelled):
+    if payload["slow"]:
+        if cancelled.wait(10):
+            slow_job_cancelled.set()
+        return None
+    return "answer"
+
+
+def test_first_result_cancels_running_worker(monkeypatch):
+    monkeypatch.setitem(work_queue.JOBS, "race", slow_or_fast_job)
+    slow_job_cancelled.clear()
+    coordinator = Coordinator("race", [{"slow": True}, {"slow": False}], heartbeat_interval=0.1)
+    host, port = coordinator.serve()
+    slow_worker = threading.Thread(target=run_worker, args=(host, port), kwargs={"name": "slow"})
+    fast_worker = threading.Thread(target=run_worker, args=(host, port), kwargs={"name": "fast"})
+    try:
+        slow_worker.start()
+        deadline = time.monotonic() + 5
+        while 0 not in coordinator.leases and time.monotonic() < deadline:
+            time.sleep(0.01)
+        fast_worker.start()
+        assert coordinator.wait(timeout=10, linger=0.5)
+        slow_worker.join(timeout=10)
+        fast_worker.join(timeout=10)
+    finally:
+        coordinator.shutdown()
+    assert coordinator.solution == "answer"
+    assert not slow_worker.is_alive() and not fast_worker.is_alive()
+    assert slow_job_cancelled.is_set()
+    assert 0 not in coordinator.results
+
+
+def test_knight_job_reports_capped_dp_assignments():
+    payload = {"assignments": [[1, 2, 3]], "mode": "dp", "max_length": 8}
+    with pytest.raises(RuntimeError, match="--max-length 8"):
+        work_queue.knight_job(payload, threading.Event())
@@ -0,0 +1,365 @@
+"""
+Small TCP work queue for spreading solver jobs over processes and machines.
+
+A coordinator holds a list of work units (JSON payloads for one job kind)
+and serves them over a TCP socket; workers, on this host or others, lease a
+unit, run it and report the result. The protocol is one JSON object per
+line, one request per connection:
+
+  {"op": "get", "worker": w}                -> {"unit": i, "kind": k, "payload": p, "heartbeat": s}
+                                               | {"wait": s} | {"stop": true}
+  {"op": "heartbeat", "worker": w, "unit": i} -> {"ok": true} | {"stop": true}
+  {"op": "result", "worker": w, "unit": i, "result": r} -> {"ok": true} | {"stop": true}
+  {"op": "error", "worker": w, "unit": i, "error": e}   -> {"ok": true} | {"stop": true}
+
+A lease lasts 'lease_timeout' seconds and is renewed by heartbeats; a unit
+whose lease runs out (worker died, host unreachable) goes back to the queue,
+up to 'max_attempts' times. A job that raises (or names an unknown kind) is
+reported with "error" and the unit is marked failed at once; the worker
+carries on with the next unit. With stop_on_result the first non-null result
+ends the run: every later request is answered with "stop", which also
+cancels running units at their next heartbeat.
+
+Job kinds are registered in JOBS as functions (payload, cancelled) -> result,
+returning None for "nothing found"; they should check the 'cancelled' Event
+between steps. Cancellation is only as fine-grained as those checks:
+knight_job checks between assignments, so a cancelled worker first finishes
+the assignment it is on.
+"""
+from collections import deque
+from typing import Callable, Dict, List, Optional
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import socketserver
+import threading
+import time
+
+from knight_trip_solver import DP_MAX_LENGTH, format_path, generate_assignments, process_assignment
+
+
+def knight_job(payload: dict, cancelled: threading.Event) -> Optional[str]:
+    """
+    A chunk of knight_trip_solver assignments; returns the answer line of the
+    first that works. If none does but the dp mode stopped at its length cap
+    on some, the unit fails with an error naming them, since longer trips
+    were never tried.
+    """
+    max_length = payload.get("max_length", DP_MAX_LENGTH)
+    capped = []
+    for assignment in payload["assignments"]:
+        if cancelled.is_set():
+            return None
+        A, B, C, success, solution = process_assignment(tuple(assignment), payload.get("mode", "bfs"), max_length)
+        if success:
+            path1, path2 = solution
+            return f"{A},{B},{C},{format_path(path1)},{format_path(path2)}"
+        if success is None:
+            capped.append(f"{A},{B},{C}")
+    if capped:
+        raise RuntimeError(f"dp stopped at --max-length {max_length} with trips still open for "
+                           f"{len(capped)} assignments ({' '.join(capped)})")
+    return None
+
+
+JOBS: Dict[str, Callable[[dict, threading.Event], object]] = {
+    "knight": knight_job,
+}
+
+
+def knight_units(chunk: int = 50, mode: str = "bfs", max_length: int = DP_MAX_LENGTH) -> List[dict]:
+    """knight_trip_solver's assignments, in its order, split into units of 'chunk' assignments."""
+    assignments = [list(a) for a in generate_assignments()]
+    return [
+        {"assignments": assignments[i:i + chunk], "mode": mode, "max_length": max_length}
+        for i in range(0, len(assignments), chunk)
+    ]
+
+
+class Coordinator:
+    """Work unit bookkeeping; serve() exposes it over TCP."""
+
+    def __init__(
+        self,
+        kind: str,
+        payloads: List[dict],
+        lease_timeout: float = 15.0,
+        heartbeat_interval: float = 5.0,
+        max_attempts: int = 3,
+        stop_on_result: bool = True,
+        token: Optional[str] = None,
+    ):
+        self.kind = kind
+        self.payloads = list(payloads)
+        self.lease_timeout = lease_timeout
+        self.heartbeat_interval = heartbeat_interval
+        self.max_attempts = max_attempts
+        self.stop_on_result = stop_on_result
+        self.token = token
+        self.pending = deque(range(len(self.payloads)))
+        self.leases: Dict[int, tuple] = {}  # unit -> (worker, deadline)
+        self.attempts = [0] * len(self.payloads)
+        self.results: Dict[int, object] = {}
+        self.failed: List[int] = []
+        self.errors: Dict[int, str] = {}
+        self.solution = None
+        self.lock = threading.Lock()
+        self.finished = threading.Event()
+        self.server = None
+
+    # ---- bookkeeping (called with the lock held) ----
+    def _expire(self, now: float):
+        for unit, (worker, deadline) in list(self.leases.items()):
+            if deadline < now:
+                del self.leases[unit]
+                if self.attempts[unit] >= self.max_attempts:
+                    self.failed.append(unit)
+                else:
+                    self.pending.appendleft(unit)  # retried before untouched units
+        self._check_finished()
+
+    def _check_finished(self):
+        if not self.pending and not self.leases:
+            self.finished.set()
+
+    def _stopping(self) -> bool:
+        return self.finished.is_set()
+
+    def handle(self, message: dict) -> dict:
+        if self.token is not None and message.get("token") != self.token:
+            return {"error": "bad token"}
+        now = time.monotonic()
+        with self.lock:
+            self._expire(now)
+            if self._stopping():
+                return {"stop": True}
+            op, worker = message.get("op"), message.get("worker")
+
+            if op == "get":
+                if not self.pending:
+                    return {"wait": self.heartbeat_interval}
+                unit = self.pending.popleft()
+                self.attempts[unit] += 1
+                self.leases[unit] = (worker, now + self.lease_timeout)
+                return {"unit": unit, "kind": self.kind, "payload": self.payloads[unit],
+                        "heartbeat": self.heartbeat_interval}
+
+            unit = message.get("unit")
+            if op == "heartbeat":
+                # Only the current holder renews: a stale worker must not take over a re-leased unit
+                if unit in self.leases and self.leases[unit][0] == worker:
+                    self.leases[unit] = (worker, now + self.lease_timeout)
+                return {"ok": True}
+
+            if op == "result":
+                # A late result for a unit that was already re-leased still counts; the first one wins
+                if unit in self.results:
+                    return {"ok": True}
+                self.leases.pop(unit, None)
+                if unit in self.pending:
+                    self.pending.remove(unit)
+                if unit in self.failed:
+                    self.failed.remove(unit)
+                result = message.get("result")
+                self.results[unit] = result
+                if result is not None and self.solution is None:
+                    self.solution = result
+                    if self.stop_on_result:
+                        self.finished.set()
+                        return {"stop": True}
+                self._check_finished()
+                return {"ok": True}
+
+            if op == "error":
+                # Retrying would raise again: fail the unit now rather than after its attempts run out
+                self.errors[unit] = str(message.get("error"))
+                if unit not in self.results:
+                    self.leases.pop(unit, None)
+                    if unit in self.pending:
+                        self.pending.remove(unit)
+                    if unit not in self.failed:
+                        self.failed.append(unit)
+                self._check_finished()
+                return {"ok": True}
+
+            return {"error": f"unknown op {op!r}"}
+
+    # ---- networking ----
+    def serve(self, host: str = "127.0.0.1", port: int = 0) -> tuple:
+        """Start serving in a background thread; returns the bound (host, port)."""
+        coordinator = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline()
+                if not line:
+                    return
+                try:
+                    reply = coordinator.handle(json.loads(line))
+                except (ValueError, TypeError) as e:
+                    reply = {"error": str(e)}
+                self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self.server = socketserver.ThreadingTCPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.server.server_address
+
+    def wait(self, timeout: Optional[float] = None, linger: float = 0.0) -> bool:
+        """
+        Block until every unit is done (or the first result arrived); lease
+        expiry is also checked here, so lost units are requeued even when no
+        worker is polling. 'linger' keeps answering "stop" for a while so
+        workers can shut down before the socket closes.
+        """
+        end = None if timeout is None else time.monotonic() + timeout
+        while not self.finished.wait(min(self.heartbeat_interval, 1.0)):
+            with self.lock:
+                self._expire(time.monotonic())
+            if end is not None and time.monotonic() > end:
+                return False
+        time.sleep(linger)
+        return True
+
+    def shutdown(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+def request(host: str, port: int, message: dict, timeout: float = 10.0) -> dict:
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        sock.sendall(json.dumps(message).encode() + b"\n")
+        with sock.makefile("rb") as f:
+            return json.loads(f.readline())
+
+
+def run_worker(host: str, port: int, token: Optional[str] = None, name: Optional[str] = None,
+               retries: int = 5) -> int:
+    """Lease and run units until the coordinator says stop or stays unreachable; returns units run."""
+    name = name or f"{socket.gethostname()}:{os.getpid()}"
+    done = 0
+    failures = 0
+
+    def send(message: dict) -> dict:
+        return request(host, port, dict(message, worker=name, token=token))
+
+    while True:
+        try:
+            reply = send({"op": "get"})
+            failures = 0
+        except OSError:
+            failures += 1
+            if failures > retries:
+                return done
+            time.sleep(min(2 ** failures, 10))
+            continue
+        if reply.get("stop") or "error" in reply:
+            return done
+        if "wait" in reply:
+            time.sleep(reply["wait"])
+            continue
+
+        unit = reply["unit"]
+        cancelled = threading.Event()
+        running = threading.Event()
+        running.set()
+
+        def heartbeat():
+            while running.is_set():
+                time.sleep(reply["heartbeat"])
+                if not running.is_set():
+                    return
+                try:
+                    if send({"op": "heartbeat", "unit": unit}).get("stop"):
+                        cancelled.set()
+                        return
+                except OSError:
+                    pass  # the coordinator may be back by the next beat; the lease covers the gap
+
+        beat = threading.Thread(target=heartbeat, daemon=True)
+        beat.start()
+        try:
+            job = JOBS.get(reply["kind"])
+            if job is None:
+                raise KeyError(f"unknown job kind {reply['kind']!r}")
+            message = {"op": "result", "unit": unit, "result": job(reply["payload"], cancelled)}
+        except Exception as e:
+            message = {"op": "error", "unit": unit, "error": f"{type(e).__name__}: {e}"}
+        finally:
+            running.clear()
+        if cancelled.is_set():
+            return done
+        done += 1
+        try:
+            if send(message).get("stop"):
+                return done
+        except OSError:
+            pass  # the lease will expire and the unit be retried
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distribute solver jobs over TCP.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for command in ("coordinator", "local"):
+        p = sub.add_parser(command, help="serve knight_trip_solver units"
+                           + ("" if command == "coordinator" else " to worker processes on this host"))
+        p.add_argument("--chunk", type=int, default=50, help="assignments per unit")
+        p.add_argument("--mode", choices=("bfs", "dp"), default="bfs", help="dp is experimental (see --max-length)")
+        p.add_argument("--max-length", type=int, default=DP_MAX_LENGTH, help="longest trip the dp mode tries")
+        p.add_argument("--lease", type=float, default=15.0, help="seconds a unit stays leased without heartbeat")
+        p.add_argument("--heartbeat", type=float, default=5.0)
+        p.add_argument("--max-attempts", type=int, default=3)
+        p.add_argument("--token", default=None)
+    sub.choices["coordinator"].add_argument("--host", default="0.0.0.0")
+    sub.choices["coordinator"].add_argument("--port", type=int, default=5555)
+    sub.choices["local"].add_argument("--workers", type=int, default=max(multiprocessing.cpu_count() - 1, 1))
+    worker = sub.add_parser("worker", help="run units from a coordinator")
+    worker.add_argument("--host", default="127.0.0.1")
+    worker.add_argument("--port", type=int, default=5555)
+    worker.add_argument("--token", default=None)
+    args = parser.parse_args()
+
+    if args.command == "worker":
+        print(f"Ran {run_worker(args.host, args.port, args.token)} units")
+        return
+
+    coordinator = Coordinator(
+        "knight", knight_units(args.chunk, args.mode, args.max_length),
+        lease_timeout=args.lease, heartbeat_interval=args.heartbeat,
+        max_attempts=args.max_attempts, token=args.token,
+    )
+    if args.command == "coordinator":
+        host, port = coordinator.serve(args.host, args.port)
+        print(f"Serving {len(coordinator.payloads)} units on {host}:{port}")
+        workers = []
+    else:
+        host, port = coordinator.serve("127.0.0.1", 0)
+        workers = [multiprocessing.Process(target=run_worker, args=(host, port, args.token))
+                   for _ in range(args.workers)]
+        for w in workers:
+            w.start()
+
+    start = time.time()
+    coordinator.wait(linger=args.heartbeat)
+    for w in workers:
+        w.join()
+    coordinator.shutdown()
+    print(f"Finished in {time.time() - start:.1f}s: {len(coordinator.results)} units done, "
+          f"{len(coordinator.failed)} failed")
+    for unit, error in sorted(coordinator.errors.items()):
+        print(f"unit {unit}: {error}")
+    if coordinator.solution is not None:
+        print("\nFinal Solution:")
+        print(coordinator.solution)
+    elif coordinator.failed:
+        print("No solution found in the units that finished; the failed ones are unsettled.")
+    else:
+        print("No solution found.")
+
+
+if __name__ == "__main__":
+    main()